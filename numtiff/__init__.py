@@ -19,12 +19,87 @@
 # IN THE SOFTWARE.
 
 from .libtiff import *
+from .libtiff import _handle_state
 import numpy
+import collections
 import contextlib
+import ctypes
+import multiprocessing.pool
+import numbers
+import os
+import sys
+import tempfile
+import threading
+import timeit
+import zlib
+
+try:
+    xrange
+except NameError: # Python 3
+    xrange = range
+
+# Classic TIFF offsets are 32-bit. Estimates are padded for compression that
+# fails to reduce the size and for the directories of each page.
+_classic_limit = 2 ** 32
+_size_margin = 1.01
+_page_overhead = 4096
+
+
+def _data_size(size):
+    if isinstance(size, numbers.Integral):
+        return size
+    if hasattr(size, "nbytes"):
+        return size.nbytes
+    return sum(numpy.asarray(image).nbytes for image in size)
+
+
+def _is_bigtiff(filename):
+    with open(filename, "rb") as f:
+        header = f.read(4)
+    return header in (b"II+\0", b"MM\0+")
+
+
+def _bigtiff_mode(filename, mode, bigtiff, size, pages):
+    # Return mode with "8" added if a BigTIFF is to be written.
+    if "w" not in mode and "a" not in mode:
+        return mode
+    if bigtiff == "auto":
+        if size is None:
+            raise ValueError('bigtiff="auto" requires the size of the data')
+        estimate = _data_size(size) * pages * _size_margin + \
+            _page_overhead * pages
+        if "a" in mode and os.path.exists(filename):
+            # LibTIFF appends in the format of the existing file.
+            if _is_bigtiff(filename):
+                return mode
+            estimate += os.path.getsize(filename)
+            if estimate >= _classic_limit:
+                raise IOError("appending would exceed the 4 GB limit of " +
+                              "classic TIFF file: %s" % filename)
+            return mode
+        bigtiff = estimate >= _classic_limit
+    if bigtiff and "8" not in mode:
+        if not has_bigtiff:
+            raise IOError("BigTIFF requires LibTIFF 4.0 or later")
+        mode += "8"
+    return mode
+
+
+def _fsencode(filename):
+    # LibTIFF takes file names as byte strings.
+    if isinstance(filename, bytes):
+        return filename
+    return filename.encode(sys.getfilesystemencoding())
+
 
 @contextlib.contextmanager
-def tiffopen(filename, mode="r"):
-    tiff = TIFFOpen(filename, mode)
+def tiffopen(filename, mode="r", bigtiff=False, size=None, pages=1):
+    # For writing or appending, bigtiff=True writes a BigTIFF, and
+    # bigtiff="auto" writes one only if the data to be written, of size bytes
+    # (an integer, an array, or a sequence of arrays) per page times pages,
+    # would not fit in a classic TIFF.
+    mode = _bigtiff_mode(filename, mode, bigtiff, size, pages)
+    tiff = TIFFOpen(_fsencode(filename), mode.encode("ascii"))
     if tiff.value is None:
         raise IOError("cannot open TIFF file: %s" % filename)
     try:
@@ -33,6 +108,186 @@ def tiffopen(filename, mode="r"):
         TIFFClose(tiff)
 
 
+class _MemoryFile(object):
+    # LibTIFF client procedures for a TIFF held in memory: a read-only buffer
+    # (which is also mapped, so that LibTIFF reads strips in place) or a
+    # bytearray that grows as LibTIFF writes to it.
+
+    def __init__(self, buffer, writable):
+        self.buffer = buffer
+        self.writable = writable
+        self.position = 0
+        if not writable:
+            try:
+                self.array = numpy.frombuffer(buffer, dtype=numpy.uint8)
+            except AttributeError: # Python 2 memoryview
+                self.array = numpy.asarray(buffer).view(numpy.uint8)
+            self.array = self.array.reshape(-1)
+        self.procs = (TIFFReadWriteProc(self.read),
+                      TIFFReadWriteProc(self.write),
+                      TIFFSeekProc(self.seek),
+                      TIFFCloseProc(self.close),
+                      TIFFSizeProc(self.size),
+                      TIFFMapFileProc(self.map),
+                      TIFFUnmapFileProc(self.unmap))
+
+    def _length(self):
+        if self.writable:
+            return len(self.buffer)
+        return self.array.size
+
+    def _address(self, offset):
+        if self.writable:
+            return ctypes.addressof(ctypes.c_char.from_buffer(self.buffer,
+                                                              offset))
+        return self.array.ctypes.data + offset
+
+    def read(self, handle, buffer, size):
+        size = max(0, min(size, self._length() - self.position))
+        if size:
+            ctypes.memmove(buffer, self._address(self.position), size)
+            self.position += size
+        return size
+
+    def write(self, handle, buffer, size):
+        if not self.writable:
+            return -1
+        end = self.position + size
+        if end > len(self.buffer):
+            self.buffer.extend(b"\0" * (end - len(self.buffer)))
+        if size:
+            ctypes.memmove(self._address(self.position), buffer, size)
+            self.position = end
+        return size
+
+    def seek(self, handle, offset, whence):
+        if whence == 1: # SEEK_CUR
+            offset += self.position
+        elif whence == 2: # SEEK_END
+            offset += self._length()
+        self.position = offset
+        return offset
+
+    def close(self, handle):
+        return 0
+
+    def size(self, handle):
+        return self._length()
+
+    def map(self, handle, base, size):
+        if self.writable:
+            return 0
+        base[0] = self._address(0)
+        size[0] = self._length()
+        return 1
+
+    def unmap(self, handle, base, size):
+        pass
+
+
+# Buffers of open in-memory TIFF handles, by handle address.
+_memory_buffers = {}
+
+
+@contextlib.contextmanager
+def tiffopen_buffer(buffer, mode="r"):
+    # Open a TIFF held in memory. For reading, buffer can be any object
+    # supporting the buffer protocol (bytes, memoryview, mmap, etc.). For
+    # writing, buffer must be a bytearray, which receives the file data.
+    writable = "r" not in mode or "+" in mode
+    if writable:
+        if not isinstance(buffer, bytearray):
+            raise TypeError("writing requires a bytearray")
+        if "w" in mode:
+            del buffer[:]
+    memory_file = _MemoryFile(buffer, writable)
+    tiff = TIFFClientOpen(b"<memory>", mode.encode("ascii"), None,
+                          *memory_file.procs)
+    if tiff.value is None:
+        raise IOError("cannot open TIFF data in memory")
+    _memory_buffers[tiff.value] = buffer if writable else memory_file.array
+    try:
+        yield tiff
+    finally:
+        del _memory_buffers[tiff.value]
+        TIFFClose(tiff)
+
+
+def _reopen(tiff):
+    # Open a second handle to the same file (e.g. for use in another thread).
+    # The directory is not set.
+    buffer = _memory_buffers.get(tiff.value)
+    if buffer is not None:
+        return tiffopen_buffer(buffer)
+    return tiffopen(TIFFFileName(tiff))
+
+
+class TiffHandlePool(object):
+    # Keeps up to max_handles idle read-only handles open for reuse, closing
+    # the least recently used. A handle is checked out to one user at a time:
+    #
+    #     with pool.open(filename) as tiff:
+    #         ...
+    #
+    # Handles are reopened if the file's modification time or size has
+    # changed, and are always positioned at the first directory on checkout.
+
+    def __init__(self, max_handles=16):
+        self.max_handles = max_handles
+        self._idle = [] # (filename, tiff, file_stat, first_offset), LRU first
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def open(self, filename):
+        entry = self._checkout(filename)
+        try:
+            yield entry[1]
+        finally:
+            self._checkin(entry)
+
+    def _checkout(self, filename):
+        st = os.stat(filename)
+        file_stat = (st.st_mtime, st.st_size)
+        entry = None
+        with self._lock:
+            for i in xrange(len(self._idle) - 1, -1, -1):
+                if self._idle[i][0] == filename:
+                    entry = self._idle.pop(i)
+                    break
+
+        if entry is not None and entry[2] != file_stat:
+            TIFFClose(entry[1])
+            entry = None
+        if entry is None:
+            tiff = TIFFOpen(_fsencode(filename), b"r")
+            if tiff.value is None:
+                raise IOError("cannot open TIFF file: %s" % filename)
+            return filename, tiff, file_stat, TIFFCurrentDirOffset(tiff).value
+
+        tiff, first_offset = entry[1], entry[3]
+        if TIFFCurrentDirOffset(tiff).value != first_offset and \
+                not TIFFSetDirectory(tiff, 0):
+            TIFFClose(tiff)
+            raise IOError("cannot read first directory of %s" % filename)
+        return entry
+
+    def _checkin(self, entry):
+        with self._lock:
+            self._idle.append(entry)
+            excess = max(len(self._idle) - self.max_handles, 0)
+            evicted = self._idle[:excess]
+            del self._idle[:excess]
+        for entry in evicted:
+            TIFFClose(entry[1])
+
+    def close(self):
+        # Close all idle handles.
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            TIFFClose(entry[1])
+
+
 def iterate_directories(tiff):
     while True: # The first directory is read when the TIFF is opened.
         yield tiff
@@ -40,10 +295,512 @@ def iterate_directories(tiff):
             break
 
 
-def read_bilevel_stripped_image(tiff):
-    photometric = c_uint16()
-    TIFFGetFieldDefaulted(tiff, TIFFTAG_PHOTOMETRIC, byref(photometric))
-    photometric = photometric.value
+def _check_region(region, height, width):
+    if region is None:
+        return 0, height, 0, width
+    y0, y1, x0, x1 = region
+    if not (0 <= y0 < y1 <= height and 0 <= x0 < x1 <= width):
+        raise ValueError("region (%d, %d, %d, %d) is empty or outside " %
+                         (y0, y1, x0, x1) +
+                         "the %d x %d image" % (height, width))
+    return y0, y1, x0, x1
+
+
+class TiffPageInfo(object):
+    # The format of a directory, read with LibTIFF once so that readers and
+    # writers need not query each field again. Get instances with
+    # page_info().
+
+    __slots__ = ("offset", "height", "width", "samples_per_pixel",
+                 "bits_per_sample", "sample_format", "photometric",
+                 "planar_config", "compression", "subfile_type", "is_tiled",
+                 "rows_per_strip", "tile_length", "tile_width")
+
+    def __init__(self, tiff):
+        def get(tag, ctype, defaulted=True):
+            value = ctype()
+            if defaulted:
+                TIFFGetFieldDefaulted(tiff, tag, byref(value))
+            else:
+                TIFFGetField(tiff, tag, byref(value))
+            return value.value
+
+        self.offset = TIFFCurrentDirOffset(tiff).value
+        self.height = get(TIFFTAG_IMAGELENGTH, c_uint32, False)
+        self.width = get(TIFFTAG_IMAGEWIDTH, c_uint32, False)
+        self.samples_per_pixel = get(TIFFTAG_SAMPLESPERPIXEL, c_uint16)
+        self.bits_per_sample = get(TIFFTAG_BITSPERSAMPLE, c_uint16)
+        self.sample_format = get(TIFFTAG_SAMPLEFORMAT, c_uint16)
+        self.photometric = get(TIFFTAG_PHOTOMETRIC, c_uint16)
+        self.planar_config = get(TIFFTAG_PLANARCONFIG, c_uint16)
+        self.compression = get(TIFFTAG_COMPRESSION, c_uint16)
+        self.subfile_type = get(TIFFTAG_SUBFILETYPE, c_uint32)
+        self.is_tiled = bool(TIFFIsTiled(tiff))
+        self.rows_per_strip = get(TIFFTAG_ROWSPERSTRIP, c_uint32)
+        self.tile_length = self.tile_width = 0
+        if self.is_tiled:
+            self.tile_length = get(TIFFTAG_TILELENGTH, c_uint32, False)
+            self.tile_width = get(TIFFTAG_TILEWIDTH, c_uint32, False)
+
+    @property
+    def dtype(self):
+        # Raises IOError if the samples are of an unsupported type.
+        return _sample_dtype(self.bits_per_sample, self.sample_format)
+
+    @property
+    def shape(self):
+        if self.samples_per_pixel > 1:
+            return self.height, self.width, self.samples_per_pixel
+        return self.height, self.width
+
+    @property
+    def block_rows(self):
+        # Rows per strip, or the tile length of a tiled image.
+        if self.is_tiled:
+            return self.tile_length
+        return self.rows_per_strip
+
+    @property
+    def strip_ranges(self):
+        # (start_row, stop_row) of each strip, or of each row of tiles.
+        rows = min(self.block_rows, self.height) or 1
+        return [(lo, min(lo + rows, self.height))
+                for lo in xrange(0, self.height, rows)]
+
+    def __repr__(self):
+        return "<TiffPageInfo at offset %d: %dx%d, %d x %d bits>" % (
+            self.offset, self.height, self.width, self.samples_per_pixel,
+            self.bits_per_sample)
+
+
+def page_info(tiff):
+    # Return the TiffPageInfo of the current directory. For handles opened
+    # read-only, it is read once per directory and then reused until the
+    # handle is closed.
+    if TIFFGetMode(tiff) != os.O_RDONLY:
+        return TiffPageInfo(tiff)
+    state = _handle_state.setdefault(tiff.value, {})
+    infos = state.setdefault("page_infos", {})
+    offset = TIFFCurrentDirOffset(tiff).value
+    info = infos.get(offset)
+    if info is None:
+        info = infos[offset] = TiffPageInfo(tiff)
+    return info
+
+
+class TileCache(object):
+    # Decoded strips and tiles, kept in least-recently-used order up to a
+    # total of max_bytes. Install with set_tile_cache() to have all reads of
+    # files opened read-only consult it before decoding.
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._blocks = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._blocks)
+
+    def get(self, key):
+        with self._lock:
+            block = self._blocks.pop(key, None)
+            if block is None:
+                self.misses += 1
+                return None
+            self._blocks[key] = block
+            self.hits += 1
+            return block
+
+    def put(self, key, block):
+        if block.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._blocks.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._blocks[key] = block
+            self.nbytes += block.nbytes
+            while self.nbytes > self.max_bytes:
+                key, old = self._blocks.popitem(last=False)
+                self.nbytes -= old.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._blocks.clear()
+            self.nbytes = 0
+
+
+_tile_cache = None
+
+
+def set_tile_cache(cache):
+    # Install cache (a TileCache, or None to disable caching) for all reads;
+    # return the previously installed cache.
+    global _tile_cache
+    previous, _tile_cache = _tile_cache, cache
+    return previous
+
+
+def _cache_key(tiff):
+    # Return a key identifying the current directory of tiff across handles,
+    # or None if its blocks are not to be cached. Only files opened read-only
+    # are cached; the open file (not its name, which may since refer to
+    # another file) is identified by device, inode, size, and mtime.
+    if _tile_cache is None or tiff.value in _memory_buffers or \
+            TIFFGetMode(tiff) != os.O_RDONLY:
+        return None
+    fd = TIFFFileno(tiff)
+    if fd < 0:
+        return None
+    try:
+        st = os.fstat(fd)
+    except OSError:
+        return None
+    return ((st.st_dev, st.st_ino, st.st_size,
+             getattr(st, "st_mtime_ns", st.st_mtime)),
+            TIFFCurrentDirOffset(tiff).value)
+
+
+def _cached_block(key, shape, dtype, decode):
+    block = _tile_cache.get(key)
+    if block is None:
+        block = numpy.empty(shape, dtype=dtype)
+        decode(block)
+        block.flags.writeable = False
+        _tile_cache.put(key, block)
+    return block
+
+
+def _read_strip(tiff, strip, data):
+    buffer = data.ctypes.data_as(c_tdata_t)
+    if TIFFReadEncodedStrip(tiff, strip, buffer, data.nbytes).value < 0:
+        raise IOError("error reading strip %d" % strip)
+
+
+def _read_tile(tiff, index, data):
+    buffer = data.ctypes.data_as(c_tdata_t)
+    if TIFFReadEncodedTile(tiff, index, buffer, data.nbytes).value < 0:
+        raise IOError("error reading tile %d" % index)
+
+
+def _uint_dtype(bits):
+    # The smallest unsigned integer type holding the given number of bits.
+    for size in (8, 16, 32, 64):
+        if bits <= size:
+            return numpy.dtype("uint%d" % size)
+
+
+def _unpack_samples(packed, bits, count, offset=0):
+    # Unpack count samples of bits bits each from each row of packed (a 2D
+    # uint8 array), starting offset bits into the row. As in TIFF, samples are
+    # packed most significant bit first.
+    rows = packed.shape[0]
+    if 8 % bits == 0:
+        # Split each byte into 8 // bits samples.
+        shifts = numpy.arange(8 - bits, -1, -bits, dtype=numpy.uint8)
+        samples = (packed[:, :, None] >> shifts) & ((1 << bits) - 1)
+        start = offset // bits
+        return samples.reshape(rows, -1)[:, start:start + count]
+
+    # Gather the bytes spanned by each sample into an integer and shift the
+    # sample out of it.
+    span = (bits + 14) // 8
+    window_dtype = numpy.uint32 if span <= 4 else numpy.uint64
+    padded = numpy.zeros((rows, packed.shape[1] + span), dtype=numpy.uint8)
+    padded[:, :packed.shape[1]] = packed
+    bit_offsets = offset + bits * numpy.arange(count)
+    first_bytes = bit_offsets // 8
+    window = numpy.zeros((rows, count), dtype=window_dtype)
+    for k in xrange(span):
+        window <<= 8
+        window |= padded[:, first_bytes + k]
+    shifts = (8 * span - bits - bit_offsets % 8).astype(window_dtype)
+    window >>= shifts
+    window &= (1 << bits) - 1
+    return window.astype(_uint_dtype(bits))
+
+
+def _pack_samples(samples, bits):
+    # Pack each row of samples (a 2D unsigned integer array) into bytes of
+    # bits-bit samples, most significant bit first; the inverse of
+    # _unpack_samples.
+    rows, count = samples.shape
+    packed = numpy.zeros((rows, -(-count * bits // 8)), dtype=numpy.uint8)
+    window_dtype = numpy.uint32 if bits <= 25 else numpy.uint64
+
+    # Every cycle samples end on a byte boundary, so the samples at the same
+    # position (phase) in each cycle start at the same bit of bytes
+    # cycle_bytes apart. Shift each phase into place and OR its bytes into
+    # the output, one strided slice per byte spanned.
+    cycle = 8 // min(bits & -bits, 8)
+    cycle_bytes = bits * cycle // 8
+    for phase in xrange(min(cycle, count)):
+        first_byte, offset = divmod(phase * bits, 8)
+        span = (offset + bits + 7) // 8
+        window = samples[:, phase::cycle].astype(window_dtype)
+        window <<= window_dtype(8 * span - bits - offset)
+        for k in xrange(span):
+            dest = packed[:, first_byte + k::cycle_bytes][:, :window.shape[1]]
+            dest |= (window >> window_dtype(8 * (span - 1 - k))).astype(
+                numpy.uint8)
+    return packed
+
+
+def _swap_triples(packed):
+    # Reverse the bytes of each 24-bit sample in each row of packed.
+    return packed.reshape(packed.shape[0], -1, 3)[:, :, ::-1].reshape(
+        packed.shape)
+
+
+# The _read_* helpers below decode the strips or tiles overlapping a window
+# of the current image into raster, whose first two axes cover rows
+# start_row:start_row + raster.shape[0] and columns
+# start_col:start_col + raster.shape[1]. Raster columns are pixels, or, if
+# bits_per_pixel is given, bytes of packed pixels of that many bits.
+
+def _read_strips(tiff, raster, start_row, start_col, image_length,
+                 image_cols, sample=0):
+    stop_row = start_row + raster.shape[0]
+    stop_col = start_col + raster.shape[1]
+    full_width = raster.shape[1] == image_cols and raster.flags.c_contiguous
+
+    rows_per_strip = min(page_info(tiff).rows_per_strip, image_length)
+
+    # Strips lying entirely inside a full-width window of a contiguous raster
+    # are decoded in place; others are decoded into a single reused buffer
+    # and the overlap copied.
+    strip_buffer = None
+    cache_key = _cache_key(tiff)
+
+    for strip_start in xrange(start_row - start_row % rows_per_strip,
+                              stop_row, rows_per_strip):
+        strip = TIFFComputeStrip(tiff, strip_start, sample).value
+        strip_stop = min(strip_start + rows_per_strip, image_length)
+        lo = max(strip_start, start_row)
+        hi = min(strip_stop, stop_row)
+        slot = raster[lo - start_row:hi - start_row]
+        in_place = full_width and lo == strip_start and hi == strip_stop
+        if cache_key is not None:
+            in_place = False
+            data = _cached_block(cache_key + (strip,),
+                                 (strip_stop - strip_start, image_cols) +
+                                 raster.shape[2:], raster.dtype,
+                                 lambda data: _read_strip(tiff, strip, data))
+        elif in_place:
+            data = slot
+            _read_strip(tiff, strip, data)
+        else:
+            if strip_buffer is None:
+                strip_buffer = numpy.empty((rows_per_strip, image_cols) +
+                                           raster.shape[2:],
+                                           dtype=raster.dtype)
+            data = strip_buffer[:strip_stop - strip_start]
+            _read_strip(tiff, strip, data)
+        if not in_place:
+            slot[...] = data[lo - strip_start:hi - strip_start,
+                             start_col:stop_col]
+
+
+def _read_tiles(tiff, raster, start_row, start_col, image_length,
+                image_cols, bits_per_pixel=None, sample=0):
+    stop_row = start_row + raster.shape[0]
+    stop_col = start_col + raster.shape[1]
+
+    info = page_info(tiff)
+    tile_cols = info.tile_width
+    if bits_per_pixel is not None:
+        tile_cols = tile_cols * bits_per_pixel // 8
+    tile_length = info.tile_length
+
+    # A tile can only be decoded in place when it spans the full width of a
+    # contiguous raster; all other tiles are decoded into a single reused
+    # buffer and the overlap copied.
+    tile = numpy.empty((tile_length, tile_cols) + raster.shape[2:],
+                       dtype=raster.dtype)
+    cache_key = _cache_key(tiff)
+
+    first_row = start_row - start_row % tile_length
+    first_col = start_col - start_col % tile_cols
+    for tile_row in xrange(first_row, stop_row, tile_length):
+        lo_row = max(tile_row, start_row)
+        hi_row = min(tile_row + tile_length, stop_row)
+        for tile_col in xrange(first_col, stop_col, tile_cols):
+            lo_col = max(tile_col, start_col)
+            hi_col = min(tile_col + tile_cols, stop_col)
+            x = tile_col
+            if bits_per_pixel is not None:
+                x = tile_col * 8 // bits_per_pixel
+            index = TIFFComputeTile(tiff, x, tile_row, 0, sample).value
+            slot = raster[lo_row - start_row:hi_row - start_row,
+                          lo_col - start_col:hi_col - start_col]
+            in_place = (slot.shape[:2] == tile.shape[:2] and
+                        tile_cols == raster.shape[1] and
+                        raster.flags.c_contiguous)
+            if cache_key is not None:
+                in_place = False
+                data = _cached_block(cache_key + (index,), tile.shape,
+                                     tile.dtype,
+                                     lambda data: _read_tile(tiff, index,
+                                                             data))
+            elif in_place:
+                _read_tile(tiff, index, slot)
+            else:
+                data = tile
+                _read_tile(tiff, index, data)
+            if not in_place:
+                slot[...] = data[lo_row - tile_row:hi_row - tile_row,
+                                 lo_col - tile_col:hi_col - tile_col]
+
+
+def _read_raster(tiff, raster, start_row=0, start_col=0,
+                 bits_per_pixel=None, workers=1, sample=0):
+    info = page_info(tiff)
+    image_length = info.height
+    image_cols = info.width
+    if bits_per_pixel is not None:
+        image_cols = -(-image_cols * bits_per_pixel // 8)
+
+    if workers > 1:
+        bands = _row_bands(tiff, start_row, start_row + raster.shape[0],
+                           workers)
+        if len(bands) > 1:
+            _read_bands(tiff, raster, bands, start_row, start_col,
+                        bits_per_pixel, sample)
+            return
+
+    if info.is_tiled:
+        _read_tiles(tiff, raster, start_row, start_col, image_length,
+                    image_cols, bits_per_pixel, sample)
+    else:
+        _read_strips(tiff, raster, start_row, start_col, image_length,
+                     image_cols, sample)
+
+
+def _row_bands(tiff, start_row, stop_row, count):
+    # Split rows start_row:stop_row into at most count bands whose boundaries
+    # fall on strip or tile boundaries, so that no strip or tile is decoded
+    # by more than one band.
+    block_rows = page_info(tiff).block_rows
+    first_block = start_row // block_rows
+    block_count = (stop_row - 1) // block_rows - first_block + 1
+    count = min(count, block_count)
+    starts = [max(start_row, (first_block + block_count * i // count) *
+                  block_rows) for i in xrange(count)]
+    return list(zip(starts, starts[1:] + [stop_row]))
+
+
+def _read_bands(tiff, raster, bands, start_row, start_col, bits_per_pixel,
+                sample=0):
+    # Each band is decoded in a worker thread using a separate handle, since
+    # a TIFF handle cannot be shared between threads. LibTIFF calls release
+    # the GIL, so the decoding runs in parallel.
+    dir_offset = TIFFCurrentDirOffset(tiff).value
+
+    def read_band(band):
+        lo, hi = band
+        with _reopen(tiff) as band_tiff:
+            if not TIFFSetSubDirectory(band_tiff, dir_offset):
+                raise IOError("cannot read directory at offset %d" %
+                              dir_offset)
+            _read_raster(band_tiff, raster[lo - start_row:hi - start_row],
+                         lo, start_col, bits_per_pixel, sample=sample)
+
+    pool = multiprocessing.pool.ThreadPool(len(bands))
+    try:
+        pool.map(read_band, bands)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _read_packed(tiff, raster, start_row, start_col, bits_per_sample,
+                 workers=1, sample=0):
+    # Like _read_raster, for samples whose size is not a multiple of 8 bits.
+    # A third axis of raster holds the samples of each pixel.
+    samples_per_pixel = raster.shape[2] if raster.ndim == 3 else 1
+    bits_per_pixel = bits_per_sample * samples_per_pixel
+    first_bit = start_col * bits_per_pixel
+    stop_bit = (start_col + raster.shape[1]) * bits_per_pixel
+    first_byte = first_bit // 8
+    packed = numpy.empty((raster.shape[0], -(-stop_bit // 8) - first_byte),
+                         dtype=numpy.uint8)
+    _read_raster(tiff, packed, start_row, first_byte, bits_per_pixel,
+                 workers=workers, sample=sample)
+    if bits_per_sample == 24 and sys.byteorder == "little":
+        # LibTIFF returns 24-bit samples in native byte order.
+        packed = _swap_triples(packed)
+    raster[...] = _unpack_samples(packed, bits_per_sample,
+                                  raster.shape[1] * samples_per_pixel,
+                                  first_bit - 8 * first_byte).reshape(
+                                      raster.shape)
+
+
+def _map_raster(tiff, shape, dtype):
+    # Return a read-only memory map of the image data if it is stored
+    # uncompressed in contiguous strips, or None if it cannot be mapped.
+    info = page_info(tiff)
+    if info.is_tiled or info.compression != COMPRESSION_NONE:
+        return None
+
+    strip_count = TIFFNumberOfStrips(tiff).value
+    c_offset = c_uint64 if has_bigtiff else c_uint32
+    offsets = POINTER(c_offset)()
+    TIFFGetField(tiff, TIFFTAG_STRIPOFFSETS, byref(offsets))
+    byte_counts = POINTER(c_offset)()
+    TIFFGetField(tiff, TIFFTAG_STRIPBYTECOUNTS, byref(byte_counts))
+    if not offsets or not byte_counts:
+        return None
+    offsets = numpy.ctypeslib.as_array(offsets, shape=(strip_count,))
+    byte_counts = numpy.ctypeslib.as_array(byte_counts, shape=(strip_count,))
+    if numpy.any(offsets[1:] != offsets[:-1] + byte_counts[:-1]):
+        return None
+    if byte_counts.sum() < numpy.prod(shape) * dtype.itemsize:
+        return None
+
+    if TIFFIsByteSwapped(tiff):
+        dtype = dtype.newbyteorder()
+    buffer = _memory_buffers.get(tiff.value)
+    if isinstance(buffer, bytearray):
+        return None # Would prevent the buffer from growing.
+    if buffer is not None:
+        return numpy.frombuffer(buffer, dtype=dtype,
+                                count=int(numpy.prod(shape)),
+                                offset=int(offsets[0])).reshape(shape)
+    return numpy.memmap(TIFFFileName(tiff), dtype=dtype, mode="r",
+                        offset=int(offsets[0]), shape=shape)
+
+
+def _check_out(out, shape, dtype):
+    # Return out after checking that it can hold the raster, or allocate.
+    if out is None:
+        return numpy.empty(shape, dtype=dtype)
+    if out.shape != tuple(shape) or out.dtype != dtype:
+        raise ValueError("out must have shape %s and dtype %s; " %
+                         (tuple(shape), dtype) +
+                         "found shape %s and dtype %s" %
+                         (out.shape, out.dtype))
+    if not out.flags.c_contiguous:
+        raise ValueError("out must be C-contiguous")
+    return out
+
+
+def _image_size(tiff):
+    info = page_info(tiff)
+    if info.width < 1:
+        raise IOError("zero image width")
+    if info.height < 1:
+        raise IOError("zero image height")
+    return info.height, info.width
+
+
+def _bilevel_format(tiff):
+    info = page_info(tiff)
+    photometric = info.photometric
     if photometric not in (PHOTOMETRIC_MINISWHITE, PHOTOMETRIC_MINISBLACK):
         raise IOError("expected monochrome image; found color image " +
                       "(photometric interpretation = %d)" % photometric)
@@ -51,57 +808,58 @@ def read_bilevel_stripped_image(tiff):
     if photometric == PHOTOMETRIC_MINISWHITE:
         inverse_intensity = True
 
-    samples_per_pixel = c_uint16()
-    TIFFGetFieldDefaulted(tiff, TIFFTAG_SAMPLESPERPIXEL,
-                          byref(samples_per_pixel))
-    samples_per_pixel = samples_per_pixel.value
+    samples_per_pixel = info.samples_per_pixel
     if samples_per_pixel > 1:
         raise IOError("expected monochrome image; found %d samples per pixel" %
                       samples_per_pixel)
 
-    bits_per_sample = c_uint16()
-    TIFFGetFieldDefaulted(tiff, TIFFTAG_BITSPERSAMPLE, byref(bits_per_sample))
-    bits_per_sample = bits_per_sample.value
+    bits_per_sample = info.bits_per_sample
     if bits_per_sample != 1:
         raise IOError("expected bilevel image; found %d bits per sample" %
                       bits_per_sample)
 
-    width = c_uint32()
-    TIFFGetField(tiff, TIFFTAG_IMAGEWIDTH, byref(width))
-    width = width.value
-    if width < 1:
-        raise IOError("zero image width")
-
-    height = c_uint32()
-    TIFFGetField(tiff, TIFFTAG_IMAGELENGTH, byref(height))
-    height = height.value
-    if height < 1:
-        raise IOError("zero image height")
+    return _image_size(tiff), numpy.dtype(numpy.uint8), inverse_intensity
 
-    if TIFFIsTiled(tiff):
-        raise IOError("reading of tiled image not implemented")
-    strip_byte_count = TIFFStripSize(tiff)
 
-    bytes_per_row = (width - 1) % 8 + 1
-    raster = numpy.empty((height, bytes_per_row), dtype=numpy.uint8)
+def read_bilevel_stripped_image(tiff, region=None, workers=1, out=None):
+    (height, width), dtype, inverse_intensity = _bilevel_format(tiff)
 
-    for strip in xrange(TIFFNumberOfStrips(tiff).value):
-        start_row = strip * rows_per_strip
-        stop_row = min(start_row + rows_per_strip, height)
-        buffer = raster[start_row:stop_row, :].ctypes.data_as(c_void_p)
-        TIFFReadEncodedStrip(tiff, strip, buffer, -1)
+    y0, y1, x0, x1 = _check_region(region, height, width)
+    out = _check_out(out, (y1 - y0, x1 - x0), dtype)
+    _read_packed(tiff, out, y0, x0, 1, workers=workers)
 
     if inverse_intensity:
-        numpy.invert(raster, out=raster)
-    raster = numpy.unpackbits(raster, axis=1)[:, :width]
+        numpy.bitwise_xor(out, 1, out=out)
 
-    return raster
+    return out
 
 
-def read_gray_stripped_image(tiff):
-    photometric = c_uint16()
-    TIFFGetFieldDefaulted(tiff, TIFFTAG_PHOTOMETRIC, byref(photometric))
-    photometric = photometric.value
+def _sample_dtype(bits_per_sample, sample_format):
+    # Samples of other than 8, 16, 32, or 64 bits are unpacked into the
+    # smallest unsigned type that holds them.
+    if bits_per_sample not in (8, 16, 32, 64):
+        if sample_format != SAMPLEFORMAT_UINT or \
+                not 0 < bits_per_sample <= 32:
+            raise IOError("only 8-, 16-, 32-, and 64-bit images, and " +
+                          "unsigned images of up to 32 bits, supported; " +
+                          "found %d bits per sample" % bits_per_sample)
+        return _uint_dtype(bits_per_sample)
+    if sample_format == SAMPLEFORMAT_UINT:
+        return numpy.dtype("uint%d" % bits_per_sample)
+    elif sample_format == SAMPLEFORMAT_INT:
+        return numpy.dtype("int%d" % bits_per_sample)
+    elif sample_format == SAMPLEFORMAT_IEEEFP:
+        if bits_per_sample not in (32, 64):
+            raise IOError("floating point images must have a sample " +
+                          "size of 32 or 64 bits; found %d bits" %
+                          bits_per_sample)
+        return numpy.dtype("float%d" % bits_per_sample)
+    raise IOError("unsupported sample format (%d)" % sample_format)
+
+
+def _gray_format(tiff):
+    info = page_info(tiff)
+    photometric = info.photometric
     if photometric not in (PHOTOMETRIC_MINISWHITE, PHOTOMETRIC_MINISBLACK):
         raise IOError("expected monochrome image; found color image " +
                       "(photometric interpretation = %d)" % photometric)
@@ -109,69 +867,41 @@ def read_gray_stripped_image(tiff):
     if photometric == PHOTOMETRIC_MINISWHITE:
         inverse_intensity = True
 
-    samples_per_pixel = c_uint16()
-    TIFFGetFieldDefaulted(tiff, TIFFTAG_SAMPLESPERPIXEL,
-                          byref(samples_per_pixel))
-    samples_per_pixel = samples_per_pixel.value
+    samples_per_pixel = info.samples_per_pixel
     if samples_per_pixel > 1:
         raise IOError("expected monochrome image; found %d samples per pixel" %
                       samples_per_pixel)
 
-    bits_per_sample = c_uint16()
-    TIFFGetFieldDefaulted(tiff, TIFFTAG_BITSPERSAMPLE, byref(bits_per_sample))
-    bits_per_sample = bits_per_sample.value
-    if bits_per_sample not in (8, 16, 32, 64):
-        raise IOError("only 8-, 16-, 32-, and 64-bit images supported; " +
-                      "found %d bits per sample" % bits_per_sample)
-
-    if bits_per_sample > 1:
-        sample_format = c_uint16()
-        TIFFGetFieldDefaulted(tiff, TIFFTAG_SAMPLEFORMAT, byref(sample_format))
-        sample_format = sample_format.value
-        if sample_format == SAMPLEFORMAT_UINT:
-            sample_dtype = numpy.dtype("uint%d" % bits_per_sample)
-        elif sample_format == SAMPLEFORMAT_INT:
-            sample_dtype = numpy.dtype("int%d" % bits_per_sample)
-        elif sample_format == SAMPLEFORMAT_IEEEFP:
-            sample_dtype = numpy.dtype("float%d" % bits_per_sample)
-            if bits_per_sample not in (32, 64):
-                raise IOError("floating point images must have a sample " +
-                              "size of 32 or 64 bits; found %d bits" %
-                              bits_per_sample)
-        else:
-            raise IOError("unsupported sample format (%d)" % sample_format)
+    bits_per_sample = info.bits_per_sample
+
+    sample_format = info.sample_format
+    sample_dtype = _sample_dtype(bits_per_sample, sample_format)
 
     if sample_format != SAMPLEFORMAT_UINT and inverse_intensity:
         raise IOError("min-is-white interpretation not allowed for " +
                       "non-unsigned-integer sample formats")
 
-    width = c_uint32()
-    TIFFGetField(tiff, TIFFTAG_IMAGEWIDTH, byref(width))
-    width = width.value
-    if width < 1:
-        raise IOError("zero image width")
+    return _image_size(tiff), sample_dtype, inverse_intensity
 
-    height = c_uint32()
-    TIFFGetField(tiff, TIFFTAG_IMAGELENGTH, byref(height))
-    height = height.value
-    if height < 1:
-        raise IOError("zero image height")
 
-    if TIFFIsTiled(tiff):
-        raise IOError("reading of tiled image not implemented")
-    strip_byte_count = TIFFStripSize(tiff)
+def read_gray_stripped_image(tiff, region=None, mmap=False, workers=1,
+                             out=None):
+    (height, width), sample_dtype, inverse_intensity = _gray_format(tiff)
 
-    rows_per_strip = c_uint32()
-    TIFFGetField(tiff, TIFFTAG_ROWSPERSTRIP, byref(rows_per_strip))
-    rows_per_strip = rows_per_strip.value
+    bits_per_sample = page_info(tiff).bits_per_sample
+    packed = bits_per_sample != 8 * sample_dtype.itemsize
 
-    raster = numpy.empty((height, width), dtype=sample_dtype)
+    y0, y1, x0, x1 = _check_region(region, height, width)
+    if mmap and out is None and not inverse_intensity and not packed:
+        raster = _map_raster(tiff, (height, width), sample_dtype)
+        if raster is not None:
+            return raster[y0:y1, x0:x1]
 
-    for strip in xrange(TIFFNumberOfStrips(tiff).value):
-        start_row = strip * rows_per_strip
-        stop_row = min(start_row + rows_per_strip, height)
-        buffer = raster[start_row:stop_row, :].ctypes.data_as(c_tdata_t)
-        TIFFReadEncodedStrip(tiff, strip, buffer, -1)
+    raster = _check_out(out, (y1 - y0, x1 - x0), sample_dtype)
+    if packed:
+        _read_packed(tiff, raster, y0, x0, bits_per_sample, workers=workers)
+    else:
+        _read_raster(tiff, raster, y0, x0, workers=workers)
 
     if inverse_intensity: # Only allowed above for uint samples.
         max_samp = 2 ** bits_per_sample - 1
@@ -180,123 +910,926 @@ def read_gray_stripped_image(tiff):
     return raster
 
 
-def read_rgb_stripped_image(tiff):
-    photometric = c_uint16()
-    TIFFGetFieldDefaulted(tiff, TIFFTAG_PHOTOMETRIC, byref(photometric))
-    photometric = photometric.value
+def _rgb_format(tiff):
+    info = page_info(tiff)
+    photometric = info.photometric
     if photometric != PHOTOMETRIC_RGB:
         raise IOError("expected RGB image")
 
-    samples_per_pixel = c_uint16()
-    TIFFGetFieldDefaulted(tiff, TIFFTAG_SAMPLESPERPIXEL,
-                          byref(samples_per_pixel))
-    samples_per_pixel = samples_per_pixel.value
+    samples_per_pixel = info.samples_per_pixel
     if samples_per_pixel != 3:
         raise IOError("expected 3 samples per pixel; found %d" %
                       samples_per_pixel)
 
-    bits_per_sample = c_uint16()
-    TIFFGetFieldDefaulted(tiff, TIFFTAG_BITSPERSAMPLE, byref(bits_per_sample))
-    bits_per_sample = bits_per_sample.value
+    bits_per_sample = info.bits_per_sample
     if bits_per_sample != 8:
             raise IOError("expected 8-bits per sample")
 
-    sample_format = c_uint16()
-    TIFFGetFieldDefaulted(tiff, TIFFTAG_SAMPLEFORMAT, byref(sample_format))
-    sample_format = sample_format.value
+    sample_format = info.sample_format
     if sample_format != SAMPLEFORMAT_UINT:
         raise IOError("sample format must be unsigned integer")
 
-    width = c_uint32()
-    TIFFGetField(tiff, TIFFTAG_IMAGEWIDTH, byref(width))
-    width = width.value
-    if width < 1:
-        raise IOError("zero image width")
+    height, width = _image_size(tiff)
 
-    height = c_uint32()
-    TIFFGetField(tiff, TIFFTAG_IMAGELENGTH, byref(height))
-    height = height.value
-    if height < 1:
-        raise IOError("zero image height")
+    if info.planar_config != PLANARCONFIG_CONTIG:
+        raise IOError("reading of planar image not implemented")
 
-    if TIFFIsTiled(tiff):
-        raise IOError("reading of tiled image not implemented")
-    strip_byte_count = TIFFStripSize(tiff)
+    return (height, width, samples_per_pixel), numpy.dtype(numpy.uint8), False
 
-    planar_config = c_uint16()
-    TIFFGetFieldDefaulted(tiff, TIFFTAG_PLANARCONFIG, byref(planar_config))
-    planar_config = planar_config.value
-    if planar_config != PLANARCONFIG_CONTIG:
-        raise IOError("reading of planar image not implemented")
 
-    rows_per_strip = c_uint32()
-    TIFFGetField(tiff, TIFFTAG_ROWSPERSTRIP, byref(rows_per_strip))
-    rows_per_strip = rows_per_strip.value
+def read_rgb_stripped_image(tiff, region=None, mmap=False, workers=1,
+                            out=None):
+    shape, dtype, inverse_intensity = _rgb_format(tiff)
+    height, width, samples_per_pixel = shape
 
-    raster = numpy.empty((height, width, samples_per_pixel), dtype=numpy.uint8)
+    y0, y1, x0, x1 = _check_region(region, height, width)
+    if mmap and out is None:
+        raster = _map_raster(tiff, shape, dtype)
+        if raster is not None:
+            return raster[y0:y1, x0:x1]
 
-    for strip in xrange(TIFFNumberOfStrips(tiff).value):
-        start_row = strip * rows_per_strip
-        stop_row = min(start_row + rows_per_strip, height)
-        buffer = raster[start_row:stop_row, :, :].ctypes.data_as(c_tdata_t)
-        TIFFReadEncodedStrip(tiff, strip, buffer, -1)
+    raster = _check_out(out, (y1 - y0, x1 - x0, samples_per_pixel), dtype)
+    _read_raster(tiff, raster, y0, x0, workers=workers)
 
     return raster
 
 
-def write_bilevel_stripped_image(tiff, image, multiplane=False,
-                                 compression=None):
-    image = numpy.asarray(image)
-    if image.dtype.kind not in ("i", "u"):
-        raise ValueError("image array must have integer or unsigned int type")
-    try:
-        height, width = image.shape
-        assert height and width
-    except:
-        raise ValueError("image must be a non-empty 2D array")
-    packed_image = numpy.packbits(image, axis=1)
-    bytes_per_row = (width - 1) % 8 + 1
+def _generic_format(tiff, channels_first=False):
+    info = page_info(tiff)
+    inverse_intensity = info.photometric == PHOTOMETRIC_MINISWHITE
+    samples_per_pixel = info.samples_per_pixel
+    sample_dtype = info.dtype
 
-    TIFFSetField(tiff, TIFFTAG_PHOTOMETRIC, PHOTOMETRIC_MINISBLACK)
-    TIFFSetField(tiff, TIFFTAG_IMAGEWIDTH, width)
-    TIFFSetField(tiff, TIFFTAG_IMAGELENGTH, height)
-    TIFFSetField(tiff, TIFFTAG_BITSPERSAMPLE, 1)
-    if compression is not None:
-        TIFFSetField(tiff, TIFFTAG_COMPRESSION, compression)
+    if info.sample_format != SAMPLEFORMAT_UINT and inverse_intensity:
+        raise IOError("min-is-white interpretation not allowed for " +
+                      "non-unsigned-integer sample formats")
 
-    rows_per_strip = TIFFDefaultStripSize(tiff, 8192)
-    TIFFSetField(tiff, TIFFTAG_ROWSPERSTRIP, rows_per_strip)
+    shape = _image_size(tiff)
+    if samples_per_pixel > 1:
+        if channels_first:
+            shape = (samples_per_pixel,) + shape
+        else:
+            shape = shape + (samples_per_pixel,)
+    return shape, sample_dtype, inverse_intensity
+
+
+def read_image(tiff, region=None, channels_first=False, workers=1, out=None):
+    # Read an image with any number of samples per pixel, of any size
+    # supported by _sample_dtype, stored with either planar configuration.
+    # Multi-sample images are returned with the samples along the last axis,
+    # or along the first if channels_first is true.
+    shape, dtype, inverse_intensity = _generic_format(tiff, channels_first)
+    if len(shape) == 2:
+        samples_per_pixel, (height, width) = 1, shape
+    elif channels_first:
+        samples_per_pixel, height, width = shape
+    else:
+        height, width, samples_per_pixel = shape
 
-    TIFFSetField(tiff, TIFFTAG_XRESOLUTION, 72.0)
-    TIFFSetField(tiff, TIFFTAG_YRESOLUTION, 72.0)
-    TIFFSetField(tiff, TIFFTAG_RESOLUTIONUNIT, RESUNIT_INCH)
+    y0, y1, x0, x1 = _check_region(region, height, width)
+    raster_shape = (y1 - y0, x1 - x0)
+    if samples_per_pixel > 1:
+        if channels_first:
+            raster_shape = (samples_per_pixel,) + raster_shape
+        else:
+            raster_shape = raster_shape + (samples_per_pixel,)
+    raster = _check_out(out, raster_shape, dtype)
 
-    if multiplane:
-        TIFFSetField(tiff, TIFFTAG_SUBFILETYPE, FILETYPE_PAGE)
-    
-    TIFFSetField(tiff, TIFFTAG_SOFTWARE, "numpytiff")
+    bits_per_sample = page_info(tiff).bits_per_sample
 
-    for strip in xrange(TIFFNumberOfStrips(tiff).value):
-        start_row = strip * rows_per_strip
-        stop_row = min(start_row + rows_per_strip, height)
-        buffer = image[start_row:stop_row, :].ctypes.data_as(c_tdata_t)
-        size = (stop_row - start_row) * bytes_per_row
-        TIFFWriteEncodedStrip(tiff, strip, buffer, size)
-    TIFFWriteDirectory(tiff)
+    def decode(raster, sample=0):
+        if bits_per_sample != 8 * dtype.itemsize:
+            _read_packed(tiff, raster, y0, x0, bits_per_sample,
+                         workers=workers, sample=sample)
+        else:
+            _read_raster(tiff, raster, y0, x0, workers=workers,
+                         sample=sample)
+
+    if samples_per_pixel == 1:
+        decode(raster)
+    elif page_info(tiff).planar_config == PLANARCONFIG_SEPARATE:
+        # Each plane is decoded straight into its channel; channel-first
+        # planes are contiguous and decoded in place.
+        for sample in xrange(samples_per_pixel):
+            if channels_first:
+                decode(raster[sample], sample)
+            else:
+                decode(raster[:, :, sample], sample)
+    elif channels_first:
+        # Interleaved samples are copied into the planes strip by strip.
+        decode(raster.transpose(1, 2, 0))
+    else:
+        decode(raster)
 
+    if inverse_intensity: # Only allowed above for uint samples.
+        max_samp = 2 ** bits_per_sample - 1
+        numpy.subtract(max_samp, raster, out=raster)
 
-def write_gray_stripped_image(tiff, image, multiplane=False, compression=None):
-    image = numpy.asarray(image)
-    dtype = image.dtype
-    if not dtype.isnative:
-        dtype = dtype.newbyteorder("=")
-    image = numpy.require(image, dtype, ["C_CONTIGUOUS", "ALIGNED"])
+    return raster
 
+
+def _image_reader(tiff):
+    # Return the read_* function matching the type of the current image.
+    # Palette and other images are read as their samples by read_image.
+    info = page_info(tiff)
+    gray = info.photometric in (PHOTOMETRIC_MINISWHITE,
+                                PHOTOMETRIC_MINISBLACK)
+    if info.photometric == PHOTOMETRIC_RGB and \
+            info.samples_per_pixel == 3 and info.bits_per_sample == 8 and \
+            info.sample_format == SAMPLEFORMAT_UINT and \
+            info.planar_config == PLANARCONFIG_CONTIG:
+        return read_rgb_stripped_image
+    elif gray and info.samples_per_pixel == 1 and \
+            info.bits_per_sample == 1:
+        return read_bilevel_stripped_image
+    elif gray and info.samples_per_pixel == 1:
+        return read_gray_stripped_image
+    return read_image
+
+
+_image_formats = {read_bilevel_stripped_image: _bilevel_format,
+                  read_gray_stripped_image: _gray_format,
+                  read_rgb_stripped_image: _rgb_format,
+                  read_image: _generic_format}
+
+
+def _image_format(tiff):
+    # Return the reader for the current image and the shape and dtype of the
+    # array it returns for the whole image.
+    read = _image_reader(tiff)
+    shape, dtype, inverse_intensity = _image_formats[read](tiff)
+    return read, shape, dtype
+
+
+def read_region(tiff, y0, y1, x0, x1, workers=1, out=None):
+    read = _image_reader(tiff)
+    return read(tiff, region=(y0, y1, x0, x1), workers=workers, out=out)
+
+
+class BufferPool(object):
+    # A small set of arrays for reuse as the out argument of the read_*
+    # functions. For each (shape, dtype), up to size arrays are allocated and
+    # then handed out again in turn, so an array may be overwritten once size
+    # more arrays of the same kind have been taken.
+
+    def __init__(self, size=2):
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+        self.size = size
+        self._buffers = {}
+
+    def get(self, shape, dtype):
+        key = (tuple(shape), numpy.dtype(dtype))
+        buffers = self._buffers.setdefault(key, [])
+        if len(buffers) < self.size:
+            buffer = numpy.empty(*key)
+        else:
+            buffer = buffers.pop(0)
+        buffers.append(buffer)
+        return buffer
+
+    def clear(self):
+        self._buffers.clear()
+
+
+def iter_strips(tiff, rows=None, readahead=False, workers=1):
+    # Yield the current image as consecutive bands of rows (by default, one
+    # strip or row of tiles at a time), decoded into a reused buffer. Each
+    # band is only valid until the next one is requested.
+    read, shape, dtype = _image_format(tiff)
+    height, width = shape[:2]
+    if rows is None:
+        rows = page_info(tiff).block_rows
+    if rows < 1:
+        raise ValueError("rows must be at least 1")
+    rows = min(rows, height)
+    bands = [(lo, min(lo + rows, height)) for lo in xrange(0, height, rows)]
+    pool = BufferPool(2 if readahead else 1)
+
+    def read_band(tiff, band):
+        lo, hi = band
+        out = pool.get((rows,) + shape[1:], dtype)[:hi - lo]
+        return read(tiff, region=(lo, hi, 0, width), workers=workers,
+                    out=out)
+
+    if not readahead:
+        for band in bands:
+            yield read_band(tiff, band)
+        return
+
+    # The next band is decoded in a background thread, using a separate
+    # handle, while the caller processes the current one.
+    dir_offset = TIFFCurrentDirOffset(tiff).value
+    with _reopen(tiff) as band_tiff:
+        if not TIFFSetSubDirectory(band_tiff, dir_offset):
+            raise IOError("cannot read directory at offset %d" % dir_offset)
+        thread = multiprocessing.pool.ThreadPool(1)
+        try:
+            pending = thread.apply_async(read_band, (band_tiff, bands[0]))
+            for band in bands[1:]:
+                raster = pending.get()
+                pending = thread.apply_async(read_band, (band_tiff, band))
+                yield raster
+            yield pending.get()
+        finally:
+            thread.close()
+            thread.join()
+
+
+class TiffStack(object):
+    # Random access to the pages (directories) of an open TIFF. The offsets
+    # of all directories are collected on first use (or taken from a saved
+    # index), after which any page is reached directly with
+    # TIFFSetSubDirectory. Accessing a page changes the current directory of
+    # the handle.
+
+    def __init__(self, tiff, index=None):
+        self.tiff = tiff
+        self._offsets = None
+        if index is not None:
+            self._offsets = [int(offset) for offset in index]
+
+    @property
+    def index(self):
+        # The directory offsets, as an array that can be saved and passed
+        # back to the constructor to skip the initial scan.
+        return numpy.array(self._directory_offsets(), dtype=numpy.uint64)
+
+    def _directory_offsets(self):
+        if self._offsets is None:
+            offsets = []
+            if TIFFSetDirectory(self.tiff, 0):
+                for tiff in iterate_directories(self.tiff):
+                    offsets.append(TIFFCurrentDirOffset(tiff).value)
+            self._offsets = offsets
+        return self._offsets
+
+    def __len__(self):
+        return len(self._directory_offsets())
+
+    def select(self, page):
+        # Make page the current directory and return the handle.
+        offset = self._directory_offsets()[page]
+        if not TIFFSetSubDirectory(self.tiff, offset):
+            raise IOError("cannot read directory at offset %d" % offset)
+        return self.tiff
+
+    def read(self, page, **kwargs):
+        tiff = self.select(page)
+        return _image_reader(tiff)(tiff, **kwargs)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return TiffStack(self.tiff, self._directory_offsets()[key])
+        return self.read(key)
+
+    def __iter__(self):
+        for page in xrange(len(self)):
+            yield self.read(page)
+
+    def iterate(self, pool=None, **kwargs):
+        # Like iter(), but decoding into arrays taken from pool, if given.
+        for page in xrange(len(self)):
+            tiff = self.select(page)
+            if pool is None:
+                yield _image_reader(tiff)(tiff, **kwargs)
+                continue
+            # The pooled array must match the region and layout requested.
+            read, shape, dtype = _image_format(tiff)
+            y0, y1, x0, x1 = _check_region(kwargs.get("region"),
+                                           shape[0], shape[1])
+            shape = (y1 - y0, x1 - x0) + shape[2:]
+            if kwargs.get("channels_first") and len(shape) == 3:
+                shape = (shape[2],) + shape[:2]
+            yield read(tiff, out=pool.get(shape, dtype), **kwargs)
+
+
+def _reduced_image(tiff):
+    return bool(page_info(tiff).subfile_type & FILETYPE_REDUCEDIMAGE)
+
+
+def image_levels(tiff):
+    # Return (height, width, offset) for the current image and each of its
+    # reduced-resolution versions, stored either as SubIFDs or as following
+    # directories marked FILETYPE_REDUCEDIMAGE, largest first. For handles
+    # opened read-only, the levels are scanned once per image and then reused
+    # until the handle is closed.
+    if TIFFGetMode(tiff) != os.O_RDONLY:
+        return _scan_levels(tiff)
+    state = _handle_state.setdefault(tiff.value, {})
+    scanned = state.setdefault("levels", {})
+    offset = TIFFCurrentDirOffset(tiff).value
+    levels = scanned.get(offset)
+    if levels is None:
+        levels = scanned[offset] = _scan_levels(tiff)
+    return list(levels)
+
+
+def _scan_levels(tiff):
+    base_offset = TIFFCurrentDirOffset(tiff).value
+    offsets = [base_offset]
+
+    count = c_uint16()
+    subifds = POINTER(c_uint64 if has_bigtiff else c_uint32)()
+    if TIFFGetField(tiff, TIFFTAG_SUBIFD, byref(count), byref(subifds)):
+        offsets.extend(subifds[i] for i in xrange(count.value))
+    while TIFFReadDirectory(tiff) and _reduced_image(tiff):
+        offsets.append(TIFFCurrentDirOffset(tiff).value)
+
+    levels = []
     try:
-        height, width = image.shape
+        for offset in offsets:
+            if not TIFFSetSubDirectory(tiff, offset):
+                raise IOError("cannot read directory at offset %d" % offset)
+            levels.append(_image_size(tiff) + (offset,))
+    finally:
+        TIFFSetSubDirectory(tiff, base_offset)
+    levels.sort(key=lambda level: level[0] * level[1], reverse=True)
+    return levels
+
+
+def read_level(tiff, max_shape, levels=None, **kwargs):
+    # Read the smallest level of the current image that is at least max_shape
+    # (the largest size the caller will scale the image to) in both
+    # dimensions, or the full-resolution image if no level is that large.
+    if levels is None:
+        levels = image_levels(tiff)
+    max_height, max_width = max_shape[:2]
+    height, width, offset = levels[0]
+    for level in levels[1:]:
+        if level[0] >= max_height and level[1] >= max_width:
+            height, width, offset = level
+
+    base_offset = TIFFCurrentDirOffset(tiff).value
+    if not TIFFSetSubDirectory(tiff, offset):
+        raise IOError("cannot read directory at offset %d" % offset)
+    try:
+        return _image_reader(tiff)(tiff, **kwargs)
+    finally:
+        TIFFSetSubDirectory(tiff, base_offset)
+
+
+def read_stack(tiff, pages=None, out=None, workers=1):
+    stack = TiffStack(tiff)
+    if pages is None:
+        pages = xrange(len(stack))
+    pages = list(pages)
+    if not pages:
+        raise ValueError("no pages to read")
+
+    # Check all pages before decoding any of them.
+    read, shape, dtype = _image_format(stack.select(pages[0]))
+    for page in pages[1:]:
+        _, page_shape, page_dtype = _image_format(stack.select(page))
+        if page_shape != shape or page_dtype != dtype:
+            raise IOError("page %d has shape %s and dtype %s; " %
+                          (page, page_shape, page_dtype) +
+                          "expected shape %s and dtype %s" % (shape, dtype))
+
+    out = _check_out(out, (len(pages),) + shape, dtype)
+    for i, page in enumerate(pages):
+        tiff = stack.select(page)
+        _image_reader(tiff)(tiff, workers=workers, out=out[i])
+
+    return out
+
+
+# Images decoded by read_many worker processes are passed back in files
+# mapped by both processes, in memory (/dev/shm) where available, so that the
+# pixel data is not pickled.
+_shared_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _read_shared(path):
+    # Decode the first image of path into a new shared file; return the
+    # file name and the shape and dtype of the image.
+    with tiffopen(path) as tiff:
+        read, shape, dtype = _image_format(tiff)
+        fd, name = tempfile.mkstemp(prefix="numtiff-", dir=_shared_dir)
+        try:
+            os.ftruncate(fd, int(numpy.prod(shape)) * dtype.itemsize)
+            read(tiff, out=numpy.memmap(name, dtype=dtype, mode="r+",
+                                        shape=shape))
+        except:
+            os.unlink(name)
+            raise
+        finally:
+            os.close(fd)
+    return name, shape, dtype.str
+
+
+def _map_shared(result):
+    name, shape, dtype = result
+    try:
+        return numpy.memmap(name, dtype=dtype, mode="r+", shape=shape)
+    finally:
+        os.unlink(name) # Freed once the array is no longer used.
+
+
+def read_many(paths, workers=None):
+    # Yield the first image of each file in paths, in order, decoded in
+    # workers processes (by default, one per CPU). At most two images per
+    # worker are decoded ahead of the caller.
+    paths = iter(paths)
+    if workers == 1:
+        for path in paths:
+            with tiffopen(path) as tiff:
+                yield _image_reader(tiff)(tiff)
+        return
+
+    workers = workers or multiprocessing.cpu_count()
+    pool = multiprocessing.pool.Pool(workers)
+    pending = collections.deque()
+    try:
+        for path in paths:
+            pending.append(pool.apply_async(_read_shared, (path,)))
+            if len(pending) >= 2 * workers:
+                yield _map_shared(pending.popleft().get())
+        while pending:
+            yield _map_shared(pending.popleft().get())
+    finally:
+        # Remove the files of images that were decoded but not consumed.
+        pool.close()
+        for result in pending:
+            try:
+                os.unlink(result.get()[0])
+            except Exception:
+                pass
+        pool.join()
+
+
+# The columns returned by scan_metadata. file indexes the list of paths;
+# block_* describe the strips (block_width is then the image width) or
+# tiles; data_offset is the offset of the first block and data_size the
+# total size of all blocks.
+_metadata_dtype = numpy.dtype([("file", "i4"), ("page", "i4"),
+                               ("offset", "u8"), ("height", "u4"),
+                               ("width", "u4"), ("samples_per_pixel", "u2"),
+                               ("bits_per_sample", "u2"),
+                               ("sample_format", "u2"), ("dtype", "S4"),
+                               ("photometric", "u2"), ("planar_config", "u2"),
+                               ("compression", "u2"), ("subfile_type", "u4"),
+                               ("tiled", "?"), ("block_length", "u4"),
+                               ("block_width", "u4"), ("block_count", "u4"),
+                               ("data_offset", "u8"), ("data_size", "u8")])
+
+
+def _dtype_code(bits_per_sample, sample_format):
+    # The NumPy type code (e.g. "u2") of the samples, or "" if unsupported.
+    try:
+        dtype = _sample_dtype(bits_per_sample, sample_format)
+    except IOError:
+        return b""
+    return dtype.str[1:].encode("ascii")
+
+
+def _directory_record(tiff):
+    info = page_info(tiff)
+    if info.is_tiled:
+        block_length, block_width = info.tile_length, info.tile_width
+        block_count = TIFFNumberOfTiles(tiff).value
+    else:
+        block_length, block_width = (min(info.rows_per_strip, info.height),
+                                     info.width)
+        block_count = TIFFNumberOfStrips(tiff).value
+
+    # The strip fields also hold the tile offsets and byte counts.
+    data_offset = data_size = 0
+    offsets = POINTER(c_uint64 if has_bigtiff else c_uint32)()
+    byte_counts = POINTER(c_uint64 if has_bigtiff else c_uint32)()
+    if block_count and \
+            TIFFGetField(tiff, TIFFTAG_STRIPOFFSETS, byref(offsets)) and \
+            TIFFGetField(tiff, TIFFTAG_STRIPBYTECOUNTS, byref(byte_counts)):
+        data_offset = offsets[0]
+        data_size = int(numpy.ctypeslib.as_array(byte_counts,
+                                                 (block_count,)).sum())
+
+    return (info.offset, info.height, info.width, info.samples_per_pixel,
+            info.bits_per_sample, info.sample_format,
+            _dtype_code(info.bits_per_sample, info.sample_format),
+            info.photometric, info.planar_config, info.compression,
+            info.subfile_type, info.is_tiled, block_length, block_width,
+            block_count, data_offset, data_size)
+
+
+def _scan_directories(tiff):
+    # Records for all directories, leaving the current directory unchanged.
+    base_offset = TIFFCurrentDirOffset(tiff).value
+    records = []
+    try:
+        if TIFFSetDirectory(tiff, 0):
+            for directory in iterate_directories(tiff):
+                records.append(_directory_record(directory))
+    finally:
+        TIFFSetSubDirectory(tiff, base_offset)
+    return records
+
+
+# Sizes of the TIFF field types that can hold the tags read by
+# _parse_directories: BYTE, SHORT, LONG, LONG8, IFD, IFD8.
+_field_type_codes = {1: "u1", 3: "u2", 4: "u4", 16: "u8", 13: "u4",
+                     18: "u8"}
+
+
+def _parse_directories(path):
+    # Records for all directories of a TIFF file, parsed directly from the
+    # file without LibTIFF.
+    with open(path, "rb") as f:
+        header = f.read(16)
+        if header[:2] == b"II":
+            order = "<"
+        elif header[:2] == b"MM":
+            order = ">"
+        else:
+            raise IOError("not a TIFF file: %s" % path)
+        version = numpy.frombuffer(header[2:4], order + "u2")[0]
+        if version == 42:
+            count_code, offset_code, entry_size = "u2", "u4", 12
+            offset = numpy.frombuffer(header[4:8], order + "u4")[0]
+        elif version == 43:
+            count_code, offset_code, entry_size = "u8", "u8", 20
+            offset = numpy.frombuffer(header[8:16], order + "u8")[0]
+        else:
+            raise IOError("not a TIFF file: %s" % path)
+        value_size = entry_size - 4 - numpy.dtype(offset_code).itemsize
+        entry_dtype = numpy.dtype([("tag", order + "u2"),
+                                   ("type", order + "u2"),
+                                   ("count", order + offset_code),
+                                   ("value", "V%d" % value_size)])
+
+        def values(entry):
+            code = _field_type_codes.get(int(entry["type"]))
+            if code is None:
+                return None
+            dtype = numpy.dtype(order + code)
+            count = int(entry["count"])
+            data = entry["value"].tobytes()
+            if count * dtype.itemsize > value_size:
+                f.seek(int(numpy.frombuffer(data, order + offset_code)[0]))
+                data = f.read(count * dtype.itemsize)
+            return numpy.frombuffer(data[:count * dtype.itemsize], dtype)
+
+        records = []
+        seen = set()
+        while offset and offset not in seen:
+            seen.add(offset)
+            f.seek(int(offset))
+            count_size = numpy.dtype(count_code).itemsize
+            count = numpy.frombuffer(f.read(count_size), order + count_code)[0]
+            entries = numpy.frombuffer(f.read(int(count) * entry_size),
+                                       entry_dtype)
+            offset_size = numpy.dtype(offset_code).itemsize
+            next_offset = numpy.frombuffer(f.read(offset_size),
+                                           order + offset_code)
+            tags = {}
+            for entry in entries:
+                tags[int(entry["tag"])] = entry
+
+            def get(tag, default=0):
+                if tag not in tags:
+                    return default
+                value = values(tags[tag])
+                if value is None or not len(value):
+                    return default
+                return int(value[0])
+
+            height = get(TIFFTAG_IMAGELENGTH)
+            width = get(TIFFTAG_IMAGEWIDTH)
+            samples_per_pixel = get(TIFFTAG_SAMPLESPERPIXEL, 1)
+            bits_per_sample = get(TIFFTAG_BITSPERSAMPLE, 1)
+            sample_format = get(TIFFTAG_SAMPLEFORMAT, SAMPLEFORMAT_UINT)
+            planar_config = get(TIFFTAG_PLANARCONFIG, PLANARCONFIG_CONTIG)
+            tiled = TIFFTAG_TILEWIDTH in tags
+            if tiled:
+                block_length = get(TIFFTAG_TILELENGTH)
+                block_width = get(TIFFTAG_TILEWIDTH)
+                offsets_tag = TIFFTAG_TILEOFFSETS
+                byte_counts_tag = TIFFTAG_TILEBYTECOUNTS
+            else:
+                block_length = min(get(TIFFTAG_ROWSPERSTRIP, 2 ** 32 - 1),
+                                   height)
+                block_width = width
+                offsets_tag = TIFFTAG_STRIPOFFSETS
+                byte_counts_tag = TIFFTAG_STRIPBYTECOUNTS
+            block_count = 0
+            data_offset = data_size = 0
+            if offsets_tag in tags:
+                block_offsets = values(tags[offsets_tag])
+                block_count = len(block_offsets)
+                if block_count:
+                    data_offset = int(block_offsets[0])
+            if byte_counts_tag in tags:
+                data_size = int(values(tags[byte_counts_tag]).sum())
+
+            records.append((offset, height, width, samples_per_pixel,
+                            bits_per_sample, sample_format,
+                            _dtype_code(bits_per_sample, sample_format),
+                            get(TIFFTAG_PHOTOMETRIC),
+                            planar_config,
+                            get(TIFFTAG_COMPRESSION, COMPRESSION_NONE),
+                            get(TIFFTAG_SUBFILETYPE), tiled, block_length,
+                            block_width, block_count, data_offset, data_size))
+            offset = next_offset[0] if len(next_offset) else 0
+    return records
+
+
+def scan_metadata(source, raw=False):
+    # Return a record array (with the columns of _metadata_dtype) describing
+    # every directory of source: an open TIFF, a file name, or a sequence of
+    # file names. With raw=True, the directories are parsed directly from
+    # the files instead of through LibTIFF, which is faster for large
+    # numbers of files; an open TIFF must then have been opened from a file.
+    # The raw layout is the one stored in the file, whereas LibTIFF may
+    # present a single large uncompressed strip as several smaller ones.
+    if isinstance(source, c_TIFF_p):
+        if raw:
+            if source.value in _memory_buffers:
+                raise ValueError("raw scan requires a TIFF file")
+            sources = [TIFFFileName(source)]
+        else:
+            sources = [source]
+    elif isinstance(source, (bytes, type(u""))):
+        sources = [source]
+    else:
+        sources = list(source)
+
+    records = []
+    for file, source in enumerate(sources):
+        if raw:
+            directories = _parse_directories(source)
+        elif isinstance(source, c_TIFF_p):
+            directories = _scan_directories(source)
+        else:
+            with tiffopen(source) as tiff:
+                directories = _scan_directories(tiff)
+        records.extend((file, page) + directory
+                       for page, directory in enumerate(directories))
+    return numpy.array(records, dtype=_metadata_dtype).view(numpy.recarray)
+
+
+_codecs = {"none": COMPRESSION_NONE,
+           "lzw": COMPRESSION_LZW,
+           "jpeg": COMPRESSION_JPEG,
+           "packbits": COMPRESSION_PACKBITS,
+           "deflate": COMPRESSION_ADOBE_DEFLATE,
+           "lzma": COMPRESSION_LZMA,
+           "zstd": COMPRESSION_ZSTD,
+           "webp": COMPRESSION_WEBP}
+
+# The pseudo-tag and range of the level of each codec that has one.
+_codec_levels = {COMPRESSION_ADOBE_DEFLATE: (TIFFTAG_ZIPQUALITY, 1, 9),
+                 COMPRESSION_DEFLATE: (TIFFTAG_ZIPQUALITY, 1, 9),
+                 COMPRESSION_JPEG: (TIFFTAG_JPEGQUALITY, 1, 100),
+                 COMPRESSION_LZMA: (TIFFTAG_LZMAPRESET, 0, 9),
+                 COMPRESSION_ZSTD: (TIFFTAG_ZSTD_LEVEL, 1, 22),
+                 COMPRESSION_WEBP: (TIFFTAG_WEBP_LEVEL, 1, 100)}
+
+_predictor_codecs = (COMPRESSION_LZW, COMPRESSION_ADOBE_DEFLATE,
+                     COMPRESSION_DEFLATE, COMPRESSION_LZMA, COMPRESSION_ZSTD)
+
+_predictors = {None: PREDICTOR_NONE,
+               "none": PREDICTOR_NONE,
+               "horizontal": PREDICTOR_HORIZONTAL,
+               "float": PREDICTOR_FLOATINGPOINT}
+
+
+class Compression(object):
+    # A compression setting for the write_* functions: codec is a name in
+    # _codecs or a COMPRESSION_* value, level the codec's quality or effort
+    # (Deflate 1-9, JPEG 1-100, LZMA 0-9, ZSTD 1-22, WebP 1-100), and
+    # predictor "horizontal", "float", or a PREDICTOR_* value. The codec must
+    # be supported by the loaded LibTIFF.
+
+    def __init__(self, codec, level=None, predictor=None):
+        self.codec = _codecs.get(codec, codec)
+        if not isinstance(self.codec, numbers.Integral):
+            raise ValueError("unknown codec: %r" % (codec,))
+        self.codec = int(self.codec)
+        if not TIFFIsCODECConfigured(self.codec):
+            raise ValueError("codec %r is not supported by LibTIFF" % (codec,))
+
+        self.level = level
+        if level is not None:
+            if self.codec not in _codec_levels:
+                raise ValueError("codec %r has no level" % (codec,))
+            tag, min_level, max_level = _codec_levels[self.codec]
+            if not min_level <= level <= max_level:
+                raise ValueError("level for codec %r must be in %d-%d" %
+                                 (codec, min_level, max_level))
+
+        self.predictor = _predictors.get(predictor, predictor)
+        if self.predictor not in (PREDICTOR_NONE, PREDICTOR_HORIZONTAL,
+                                  PREDICTOR_FLOATINGPOINT):
+            raise ValueError("unknown predictor: %r" % (predictor,))
+        self.predictor = int(self.predictor)
+        if self.predictor != PREDICTOR_NONE and \
+                self.codec not in _predictor_codecs:
+            raise ValueError("codec %r does not take a predictor" % (codec,))
+
+    def __repr__(self):
+        names = dict((code, name) for name, code in _codecs.items())
+        predictors = {PREDICTOR_NONE: None,
+                      PREDICTOR_HORIZONTAL: "horizontal",
+                      PREDICTOR_FLOATINGPOINT: "float"}
+        return "Compression(%r, level=%r, predictor=%r)" % \
+            (names.get(self.codec, self.codec), self.level,
+             predictors[self.predictor])
+
+    def _set_fields(self, tiff):
+        # Set the fields of the current directory, whose sample fields must
+        # already be set.
+        if self.predictor != PREDICTOR_NONE:
+            info = page_info(tiff)
+            bits_per_sample = info.bits_per_sample
+            if self.predictor == PREDICTOR_FLOATINGPOINT and \
+                    info.sample_format != SAMPLEFORMAT_IEEEFP:
+                raise ValueError("floating point predictor requires a " +
+                                 "floating point image")
+            if bits_per_sample not in (8, 16, 32, 64):
+                raise ValueError("predictor not supported for %d-bit samples" %
+                                 bits_per_sample)
+
+        TIFFSetField(tiff, TIFFTAG_COMPRESSION, self.codec)
+        # The codec's pseudo-tags exist only once the compression is set.
+        if self.level is not None:
+            TIFFSetField(tiff, _codec_levels[self.codec][0], self.level)
+        if self.predictor != PREDICTOR_NONE:
+            TIFFSetField(tiff, TIFFTAG_PREDICTOR, self.predictor)
+
+
+def _set_compression(tiff, compression):
+    # compression is None, a Compression, or a COMPRESSION_* value.
+    if compression is None:
+        return
+    if not isinstance(compression, Compression):
+        compression = Compression(compression)
+    compression._set_fields(tiff)
+
+
+def _predict(data, predictor):
+    # Apply the TIFF predictor to a strip, as libtiff does before encoding.
+    if predictor == PREDICTOR_HORIZONTAL:
+        # Differencing is done on the sample bit patterns, as in libtiff.
+        data = data.view("u%d" % data.dtype.itemsize)
+        diff = numpy.empty_like(data)
+        diff[:, 0] = data[:, 0]
+        numpy.subtract(data[:, 1:], data[:, :-1], out=diff[:, 1:])
+        return diff
+    if predictor == PREDICTOR_FLOATINGPOINT:
+        # Each row is split into byte planes, most significant byte first,
+        # followed by byte-wise differencing between adjacent pixels.
+        rows = data.shape[0]
+        stride = data.shape[2] if data.ndim == 3 else 1
+        planes = data.reshape(rows, -1, 1).view(numpy.uint8)
+        if sys.byteorder == "little":
+            planes = planes[:, :, ::-1]
+        planes = planes.transpose(0, 2, 1).reshape(rows, -1)
+        diff = numpy.empty_like(planes)
+        diff[:, :stride] = planes[:, :stride]
+        numpy.subtract(planes[:, stride:], planes[:, :-stride],
+                       out=diff[:, stride:])
+        return diff
+    return data
+
+
+def _deflate_strip(args):
+    data, pack, predictor, byte_swapped, bits_per_sample, level = args
+    if pack is not None:
+        data = pack(data)
+    data = _predict(data, predictor)
+    if byte_swapped and predictor != PREDICTOR_FLOATINGPOINT:
+        if bits_per_sample == 24:
+            data = _swap_triples(data)
+        else:
+            data = data.byteswap()
+    return zlib.compress(numpy.ascontiguousarray(data), level)
+
+
+def _parallel_deflate(tiff, workers):
+    # Whether _write_strips compresses the strips in worker threads.
+    if workers <= 1:
+        return False
+    compression = c_uint16()
+    TIFFGetFieldDefaulted(tiff, TIFFTAG_COMPRESSION, byref(compression))
+    return compression.value in (COMPRESSION_ADOBE_DEFLATE,
+                                 COMPRESSION_DEFLATE)
+
+
+# The writers' default strip size. Strips are encoded and buffered whole, so
+# this bounds the memory used per strip regardless of the codec.
+_strip_bytes = 1 << 16
+
+
+def _rows_per_strip(tiff, height, workers=1):
+    # Must be called after the sample fields are set.
+    row_bytes = max(1, TIFFScanlineSize(tiff).value)
+    rows_per_strip = min(max(1, _strip_bytes // row_bytes), height)
+    if _parallel_deflate(tiff, workers):
+        # Make sure there are enough strips to compress in parallel.
+        rows_per_strip = min(rows_per_strip, -(-height // workers))
+    return rows_per_strip
+
+
+# Whether LibTIFF must be given pre-swapped data to write floating point
+# predicted images to byte-swapped files; see _presorted_float_predictor.
+_swab_before_float_predictor = None
+
+
+def _check_float_predictor_swab():
+    # Write a small image with the floating point predictor to a byte-swapped
+    # file in memory, passing the samples as is, and see if it reads back.
+    image = numpy.array([[1.0, -2.5, 3.25]], dtype=numpy.float32)
+    buffer = bytearray()
+    with tiffopen_buffer(buffer, "wl" if sys.byteorder == "big" else "wb") \
+            as tiff:
+        _set_gray_fields(tiff, image.shape, image.dtype)
+        TIFFSetField(tiff, TIFFTAG_COMPRESSION, COMPRESSION_LZW)
+        TIFFSetField(tiff, TIFFTAG_PREDICTOR, PREDICTOR_FLOATINGPOINT)
+        TIFFSetField(tiff, TIFFTAG_ROWSPERSTRIP, 1)
+        data = image.copy()
+        TIFFWriteEncodedStrip(tiff, 0, data.ctypes.data_as(c_tdata_t),
+                              data.nbytes)
+        if not TIFFWriteDirectory(tiff):
+            raise IOError("error writing directory")
+    with tiffopen_buffer(bytes(buffer)) as tiff:
+        return not (read_gray_stripped_image(tiff) == image).all()
+
+
+def _presorted_float_predictor(tiff):
+    # Whether data for LibTIFF to encode into the current directory must be
+    # passed byte-swapped. Some versions of LibTIFF (at least 4.5) swap the
+    # bytes of the samples before applying the floating point predictor,
+    # which expects native samples, so the bytes must be swapped beforehand.
+    global _swab_before_float_predictor
+    if not TIFFIsByteSwapped(tiff):
+        return False
+    predictor = c_uint16()
+    if not TIFFGetField(tiff, TIFFTAG_PREDICTOR, byref(predictor)) or \
+            predictor.value != PREDICTOR_FLOATINGPOINT:
+        return False
+    if _swab_before_float_predictor is None:
+        _swab_before_float_predictor = _check_float_predictor_swab()
+    return _swab_before_float_predictor
+
+
+def _write_strip(tiff, strip, data):
+    if data.dtype.itemsize > 1 and TIFFIsByteSwapped(tiff):
+        # LibTIFF swaps the bytes in place; don't modify the caller's data.
+        if _presorted_float_predictor(tiff):
+            data = data.byteswap()
+        else:
+            data = data.copy()
+    buffer = data.ctypes.data_as(c_tdata_t)
+    if TIFFWriteEncodedStrip(tiff, strip, buffer, data.nbytes).value < 0:
+        raise IOError("error writing strip %d" % strip)
+
+
+def _write_strips(tiff, image, rows_per_strip, workers=1, pack=None):
+    # If given, pack(strip) converts each strip of image to the data to be
+    # written, so that only a strip at a time is converted.
+    height = image.shape[0]
+    strips = [image[start_row:start_row + rows_per_strip]
+              for start_row in xrange(0, height, rows_per_strip)]
+
+    if len(strips) > 1 and _parallel_deflate(tiff, workers):
+        # Compress the strips in worker threads (zlib releases the GIL) and
+        # write the results in order.
+        predictor = c_uint16()
+        TIFFGetFieldDefaulted(tiff, TIFFTAG_PREDICTOR, byref(predictor))
+        level = c_int(-1) # Z_DEFAULT_COMPRESSION
+        TIFFGetField(tiff, TIFFTAG_ZIPQUALITY, byref(level))
+        byte_swapped = TIFFIsByteSwapped(tiff)
+        bits_per_sample = c_uint16()
+        TIFFGetFieldDefaulted(tiff, TIFFTAG_BITSPERSAMPLE,
+                              byref(bits_per_sample))
+        jobs = [(strip, pack, predictor.value, byte_swapped,
+                 bits_per_sample.value, level.value) for strip in strips]
+        pool = multiprocessing.pool.ThreadPool(workers)
+        try:
+            for strip, data in enumerate(pool.imap(_deflate_strip, jobs)):
+                if TIFFWriteRawStrip(tiff, strip, data, len(data)).value < 0:
+                    raise IOError("error writing strip %d" % strip)
+        finally:
+            pool.close()
+            pool.join()
+        return
+
+    for strip, data in enumerate(strips):
+        if pack is not None:
+            data = pack(data)
+        _write_strip(tiff, strip, data)
+
+
+def _set_gray_fields(tiff, shape, dtype, bits_per_sample=None):
+    try:
+        height, width = shape
         assert height and width
     except:
         raise ValueError("image must be a non-empty 2D array")
+    if bits_per_sample is not None and (dtype.kind != "u" or
+            not 0 < bits_per_sample <= 8 * dtype.itemsize):
+        raise ValueError("bits_per_sample requires an unsigned int image " +
+                         "and must not exceed the size of its type")
     if dtype.kind == "i":
         sample_format = SAMPLEFORMAT_INT
     elif dtype.kind == "u":
@@ -306,49 +1839,21 @@ def write_gray_stripped_image(tiff, image, multiplane=False, compression=None):
     else:
         raise ValueError("image array must have integer, unsigned int, or " +
                          "floating point type")
-    bits_per_sample = 8 * dtype.itemsize
-    bytes_per_row = width * dtype.itemsize
+    if bits_per_sample is None:
+        bits_per_sample = 8 * dtype.itemsize
 
     TIFFSetField(tiff, TIFFTAG_PHOTOMETRIC, PHOTOMETRIC_MINISBLACK)
     TIFFSetField(tiff, TIFFTAG_IMAGEWIDTH, width)
     TIFFSetField(tiff, TIFFTAG_IMAGELENGTH, height)
     TIFFSetField(tiff, TIFFTAG_BITSPERSAMPLE, bits_per_sample)
     TIFFSetField(tiff, TIFFTAG_SAMPLEFORMAT, sample_format)
-    if compression is not None:
-        TIFFSetField(tiff, TIFFTAG_COMPRESSION, compression)
-
-    rows_per_strip = TIFFDefaultStripSize(tiff, 8192)
-    TIFFSetField(tiff, TIFFTAG_ROWSPERSTRIP, rows_per_strip)
-
-    TIFFSetField(tiff, TIFFTAG_XRESOLUTION, 72.0)
-    TIFFSetField(tiff, TIFFTAG_YRESOLUTION, 72.0)
-    TIFFSetField(tiff, TIFFTAG_RESOLUTIONUNIT, RESUNIT_INCH)
-
-    if multiplane:
-        TIFFSetField(tiff, TIFFTAG_SUBFILETYPE, FILETYPE_PAGE)
-    
-    TIFFSetField(tiff, TIFFTAG_SOFTWARE, "numpytiff")
 
-    for strip in xrange(TIFFNumberOfStrips(tiff).value):
-        start_row = strip * rows_per_strip
-        stop_row = min(start_row + rows_per_strip, height)
-        buffer = image[start_row:stop_row, :].ctypes.data_as(c_tdata_t)
-        size = (stop_row - start_row) * bytes_per_row
-        TIFFWriteEncodedStrip(tiff, strip, buffer, size)
-    TIFFWriteDirectory(tiff)
 
-
-def write_rgb_stripped_image(tiff, image, multiplane=False, compression=None):
-    image = numpy.asarray(image)
-    dtype = image.dtype
+def _set_rgb_fields(tiff, shape, dtype):
     if dtype.kind != "u" or dtype.itemsize != 1:
         raise ValueError("image array must have type uint8")
-    if not dtype.isnative:
-        dtype = dtype.newbyteorder("=")
-    image = numpy.require(image, dtype, ["C_CONTIGUOUS", "ALIGNED"])
-
     try:
-        height, width, samples_per_pixel = image.shape
+        height, width, samples_per_pixel = shape
         assert height and width
         assert samples_per_pixel == 3
     except:
@@ -356,7 +1861,6 @@ def write_rgb_stripped_image(tiff, image, multiplane=False, compression=None):
                          "axis 2 having length 3")
 
     bits_per_sample = 8
-    bytes_per_row = width * samples_per_pixel * dtype.itemsize
 
     TIFFSetField(tiff, TIFFTAG_PHOTOMETRIC, PHOTOMETRIC_RGB)
     TIFFSetField(tiff, TIFFTAG_IMAGEWIDTH, width)
@@ -364,29 +1868,356 @@ def write_rgb_stripped_image(tiff, image, multiplane=False, compression=None):
     TIFFSetField(tiff, TIFFTAG_SAMPLESPERPIXEL, samples_per_pixel)
     TIFFSetField(tiff, TIFFTAG_BITSPERSAMPLE, bits_per_sample)
     TIFFSetField(tiff, TIFFTAG_SAMPLEFORMAT, SAMPLEFORMAT_UINT)
-    if compression is not None:
-        TIFFSetField(tiff, TIFFTAG_COMPRESSION, compression)
+    TIFFSetField(tiff, TIFFTAG_PLANARCONFIG, PLANARCONFIG_CONTIG)
 
-    rows_per_strip = TIFFDefaultStripSize(tiff, 8192)
-    TIFFSetField(tiff, TIFFTAG_ROWSPERSTRIP, rows_per_strip)
+
+def _set_common_fields(tiff, multiplane=False, compression=None):
+    _set_compression(tiff, compression)
 
     TIFFSetField(tiff, TIFFTAG_XRESOLUTION, 72.0)
     TIFFSetField(tiff, TIFFTAG_YRESOLUTION, 72.0)
     TIFFSetField(tiff, TIFFTAG_RESOLUTIONUNIT, RESUNIT_INCH)
 
-    TIFFSetField(tiff, TIFFTAG_PLANARCONFIG, PLANARCONFIG_CONTIG)
-
     if multiplane:
         TIFFSetField(tiff, TIFFTAG_SUBFILETYPE, FILETYPE_PAGE)
 
-    TIFFSetField(tiff, TIFFTAG_SOFTWARE, "numpytiff")
+    TIFFSetField(tiff, TIFFTAG_SOFTWARE, b"numpytiff")
+
+
+def _set_rows_per_strip(tiff, height, rows_per_strip=None, workers=1):
+    # Must be called after the compression is set.
+    if rows_per_strip is None:
+        rows_per_strip = _rows_per_strip(tiff, height, workers)
+    TIFFSetField(tiff, TIFFTAG_ROWSPERSTRIP, rows_per_strip)
+    return rows_per_strip
+
+
+def _native(dtype):
+    if not dtype.isnative:
+        dtype = dtype.newbyteorder("=")
+    return dtype
+
+
+def write_bilevel_stripped_image(tiff, image, multiplane=False,
+                                 compression=None, workers=1):
+    image = numpy.asarray(image)
+    if image.dtype.kind not in ("i", "u"):
+        raise ValueError("image array must have integer or unsigned int type")
+    try:
+        height, width = image.shape
+        assert height and width
+    except:
+        raise ValueError("image must be a non-empty 2D array")
+
+    TIFFSetField(tiff, TIFFTAG_PHOTOMETRIC, PHOTOMETRIC_MINISBLACK)
+    TIFFSetField(tiff, TIFFTAG_IMAGEWIDTH, width)
+    TIFFSetField(tiff, TIFFTAG_IMAGELENGTH, height)
+    TIFFSetField(tiff, TIFFTAG_BITSPERSAMPLE, 1)
+    _set_common_fields(tiff, multiplane, compression)
+    rows_per_strip = _set_rows_per_strip(tiff, height, workers=workers)
+
+    _write_strips(tiff, image, rows_per_strip, workers,
+                  lambda strip: _pack_samples(strip != 0, 1))
+    if not TIFFWriteDirectory(tiff):
+        raise IOError("error writing directory")
+
+
+def _check_bits(image, bits_per_sample):
+    # Whether a 2D image must be packed for writing with bits_per_sample bits
+    # per sample (that is, if that is smaller than its type). Raise if its
+    # values do not fit.
+    if bits_per_sample is None or bits_per_sample == 8 * image.dtype.itemsize:
+        return False
+    if image.size and image.max() >> image.dtype.type(bits_per_sample):
+        raise ValueError("image values do not fit in %d bits" %
+                         bits_per_sample)
+    return True
+
+
+def _pack_strip(strip, bits_per_sample):
+    # Convert a strip of samples to the data LibTIFF writes with
+    # bits_per_sample bits per sample: packed, most significant bit first,
+    # or, for whole bytes, samples in native byte order, which LibTIFF swaps
+    # to that of the file.
+    if bits_per_sample % 8:
+        return _pack_samples(strip, bits_per_sample)
+    if bits_per_sample != 24:
+        return strip.astype(_uint_dtype(bits_per_sample))
+    packed = _pack_samples(strip, 24)
+    if sys.byteorder == "little":
+        packed = _swap_triples(packed)
+    return packed
+
+
+def _pack_rows(image, bits_per_sample):
+    # Pack a 2D image for writing with bits_per_sample bits per sample, if
+    # that is smaller than its type.
+    if not _check_bits(image, bits_per_sample):
+        return image
+    return _pack_strip(image, bits_per_sample)
+
+
+def write_gray_stripped_image(tiff, image, multiplane=False, compression=None,
+                              workers=1, bits_per_sample=None):
+    image = numpy.asarray(image)
+    dtype = _native(image.dtype)
+    image = numpy.require(image, dtype, ["C_CONTIGUOUS", "ALIGNED"])
+
+    _set_gray_fields(tiff, image.shape, dtype, bits_per_sample)
+    pack = None
+    if _check_bits(image, bits_per_sample):
+        pack = lambda strip: _pack_strip(strip, bits_per_sample)
+    _set_common_fields(tiff, multiplane, compression)
+    rows_per_strip = _set_rows_per_strip(tiff, image.shape[0],
+                                         workers=workers)
+
+    _write_strips(tiff, image, rows_per_strip, workers, pack)
+    if not TIFFWriteDirectory(tiff):
+        raise IOError("error writing directory")
+
+
+def write_rgb_stripped_image(tiff, image, multiplane=False, compression=None,
+                             workers=1):
+    image = numpy.asarray(image)
+    dtype = _native(image.dtype)
+    _set_rgb_fields(tiff, image.shape, dtype)
+    image = numpy.require(image, dtype, ["C_CONTIGUOUS", "ALIGNED"])
+
+    _set_common_fields(tiff, multiplane, compression)
+    rows_per_strip = _set_rows_per_strip(tiff, image.shape[0],
+                                         workers=workers)
 
-    for strip in xrange(TIFFNumberOfStrips(tiff).value):
-        start_row = strip * rows_per_strip
-        stop_row = min(start_row + rows_per_strip, height)
-        buffer = image[start_row:stop_row, :, :].ctypes.data_as(c_tdata_t)
-        size = (stop_row - start_row) * bytes_per_row
-        TIFFWriteEncodedStrip(tiff, strip, buffer, size)
-    TIFFWriteDirectory(tiff)
+    _write_strips(tiff, image, rows_per_strip, workers)
+    if not TIFFWriteDirectory(tiff):
+        raise IOError("error writing directory")
 
 
+def _set_image_fields(tiff, shape, dtype):
+    if len(shape) == 3:
+        _set_rgb_fields(tiff, shape, dtype)
+    else:
+        _set_gray_fields(tiff, shape, dtype)
+
+
+def _downsample(image):
+    # Halve the image in each dimension by averaging 2x2 blocks. For odd
+    # sizes, the last row or column is repeated.
+    height, width = image.shape[:2]
+    if height % 2 or width % 2:
+        padding = ((0, height % 2), (0, width % 2)) + ((0, 0),) * \
+                  (image.ndim - 2)
+        image = numpy.pad(image, padding, mode="edge")
+    blocks = image.reshape((image.shape[0] // 2, 2, image.shape[1] // 2, 2) +
+                           image.shape[2:])
+    if image.dtype.kind == "f":
+        return blocks.mean(axis=(1, 3), dtype=image.dtype)
+    sums = blocks.sum(axis=(1, 3), dtype=image.dtype.kind + "8")
+    return ((sums + 2) // 4).astype(image.dtype)
+
+
+def _write_tiles(tiff, image, tile_length, tile_width):
+    height, width = image.shape[:2]
+    # Tiles are copied into a buffer, padded with zeros at the edges.
+    tile = numpy.empty((tile_length, tile_width) + image.shape[2:],
+                       dtype=image.dtype)
+    buffer = tile.ctypes.data_as(c_tdata_t)
+    presorted = _presorted_float_predictor(tiff)
+    for row in xrange(0, height, tile_length):
+        for col in xrange(0, width, tile_width):
+            data = image[row:row + tile_length, col:col + tile_width]
+            if data.shape[:2] != tile.shape[:2]:
+                tile.fill(0)
+            tile[:data.shape[0], :data.shape[1]] = data
+            if presorted:
+                tile.byteswap(True)
+            index = TIFFComputeTile(tiff, col, row, 0, 0)
+            if TIFFWriteEncodedTile(tiff, index, buffer,
+                                    tile.nbytes).value < 0:
+                raise IOError("error writing tile %d" % index.value)
+
+
+def write_tiled_image(tiff, image, tile=(256, 256), multiplane=False,
+                      compression=None, levels=0):
+    # Write a gray or RGB image in tiles of tile = (length, width) pixels (or
+    # LibTIFF's default if None), followed by levels reduced-resolution
+    # copies, each half the size of the previous one, as SubIFDs.
+    if tile is not None:
+        tile_length, tile_width = tile
+        if tile_length % 16 or tile_width % 16 or not tile_length or \
+                not tile_width:
+            raise ValueError("tile dimensions must be positive multiples " +
+                             "of 16")
+
+    image = numpy.asarray(image)
+    dtype = _native(image.dtype)
+    _set_image_fields(tiff, image.shape, dtype)
+    image = numpy.require(image, dtype, ["C_CONTIGUOUS", "ALIGNED"])
+    _set_common_fields(tiff, multiplane, compression)
+
+    if tile is None:
+        tile_width, tile_length = c_uint32(0), c_uint32(0)
+        TIFFDefaultTileSize(tiff, byref(tile_width), byref(tile_length))
+        tile_length, tile_width = tile_length.value, tile_width.value
+    TIFFSetField(tiff, TIFFTAG_TILEWIDTH, tile_width)
+    TIFFSetField(tiff, TIFFTAG_TILELENGTH, tile_length)
+
+    if levels:
+        # LibTIFF writes the next levels directories as SubIFDs and fills
+        # in their offsets.
+        offset_type = c_uint64 if has_bigtiff else c_uint32
+        TIFFSetField(tiff, TIFFTAG_SUBIFD, levels, (offset_type * levels)())
+
+    _write_tiles(tiff, image, tile_length, tile_width)
+    if not TIFFWriteDirectory(tiff):
+        raise IOError("error writing directory")
+
+    for level in xrange(levels):
+        image = _downsample(image)
+        _set_image_fields(tiff, image.shape, dtype)
+        _set_common_fields(tiff, False, compression)
+        TIFFSetField(tiff, TIFFTAG_SUBFILETYPE, FILETYPE_REDUCEDIMAGE)
+        TIFFSetField(tiff, TIFFTAG_TILEWIDTH, tile_width)
+        TIFFSetField(tiff, TIFFTAG_TILELENGTH, tile_length)
+        _write_tiles(tiff, image, tile_length, tile_width)
+        if not TIFFWriteDirectory(tiff):
+            raise IOError("error writing directory")
+
+
+def _compression_candidates(dtype):
+    predictor = "float" if dtype.kind == "f" else "horizontal"
+    # Deflate without a predictor, for data the predictor does not help;
+    # the levels below all use one.
+    candidates = [Compression("lzw", predictor=predictor),
+                  Compression("deflate", 6)]
+    for level in (1, 6, 9):
+        candidates.append(Compression("deflate", level, predictor))
+    if TIFFIsCODECConfigured(COMPRESSION_ZSTD):
+        for level in (3, 9, 19):
+            candidates.append(Compression("zstd", level, predictor))
+    return candidates
+
+
+def tune_compression(image, candidates=None, min_throughput=0):
+    # Write image (gray or RGB) to memory with each candidate Compression
+    # (by default, LZW, Deflate, and ZSTD at a few levels, with a suitable
+    # predictor) and return (compression, ratio, throughput) for the best
+    # ratio among those compressing at least min_throughput bytes per second,
+    # or for the fastest if none do.
+    image = numpy.asarray(image)
+    if candidates is None:
+        candidates = _compression_candidates(image.dtype)
+    if image.ndim == 3:
+        write = write_rgb_stripped_image
+    else:
+        write = write_gray_stripped_image
+
+    results = []
+    for compression in candidates:
+        buffer = bytearray()
+        start = timeit.default_timer()
+        with tiffopen_buffer(buffer, "w") as tiff:
+            write(tiff, image, compression=compression)
+        elapsed = max(timeit.default_timer() - start, 1e-9)
+        results.append((compression, float(image.nbytes) / len(buffer),
+                        image.nbytes / elapsed))
+
+    fast = [result for result in results if result[2] >= min_throughput]
+    if fast:
+        return max(fast, key=lambda result: result[1])
+    return max(results, key=lambda result: result[2])
+
+
+class TiffWriter(object):
+    # Write gray or RGB pages band by band. Only one strip is buffered, so
+    # memory use is bounded by the strip size rather than the image size:
+    #
+    #     writer = TiffWriter(tiff)
+    #     writer.begin_page((height, width), numpy.uint16)
+    #     for band in bands:
+    #         writer.write_rows(band)
+    #     writer.end_page()
+
+    def __init__(self, tiff):
+        self.tiff = tiff
+        self.shape = None
+
+    def begin_page(self, shape, dtype, multiplane=False, compression=None,
+                   rows_per_strip=None, bits_per_sample=None):
+        if self.shape is not None:
+            raise RuntimeError("previous page not ended")
+        shape = tuple(shape)
+        dtype = _native(numpy.dtype(dtype))
+        if len(shape) == 3:
+            _set_rgb_fields(self.tiff, shape, dtype)
+        else:
+            _set_gray_fields(self.tiff, shape, dtype, bits_per_sample)
+        _set_common_fields(self.tiff, multiplane, compression)
+        rows_per_strip = _set_rows_per_strip(self.tiff, shape[0],
+                                             rows_per_strip)
+
+        self.shape = shape
+        self.dtype = dtype
+        self.bits_per_sample = bits_per_sample
+        self.rows_written = 0
+        # A strip may be taller than the image; the buffer need not be.
+        self._strip_buffer = numpy.empty((min(rows_per_strip, shape[0]),) +
+                                         shape[1:], dtype=dtype)
+        self._buffered = 0
+        self._strip = 0
+
+    def write_rows(self, band):
+        if self.shape is None:
+            raise RuntimeError("no page begun")
+        band = numpy.asarray(band)
+        if band.shape[1:] != self.shape[1:]:
+            raise ValueError("band must have shape (rows,) + %s; found %s" %
+                             (self.shape[1:], band.shape))
+        if self.rows_written + band.shape[0] > self.shape[0]:
+            raise ValueError("band exceeds the image height (%d rows)" %
+                             self.shape[0])
+        if not numpy.can_cast(band.dtype, self.dtype, "safe"):
+            raise ValueError("cannot write %s rows to a %s image " %
+                             (band.dtype, self.dtype) +
+                             "without loss of precision")
+
+        rows_per_strip = self._strip_buffer.shape[0]
+        while band.shape[0]:
+            if (not self._buffered and band.shape[0] >= rows_per_strip and
+                    band.dtype == self.dtype and
+                    band.flags.c_contiguous and band.flags.aligned):
+                # Whole strips are written straight from the band.
+                self._write(band[:rows_per_strip])
+                band = band[rows_per_strip:]
+                continue
+            rows = min(band.shape[0], rows_per_strip - self._buffered)
+            self._strip_buffer[self._buffered:self._buffered + rows] = \
+                band[:rows]
+            self._buffered += rows
+            band = band[rows:]
+            if (self._buffered == rows_per_strip or
+                    self.rows_written + self._buffered == self.shape[0]):
+                self._write(self._strip_buffer[:self._buffered])
+                self._buffered = 0
+
+    def _write(self, data):
+        _write_strip(self.tiff, self._strip,
+                     _pack_rows(data, self.bits_per_sample))
+        self._strip += 1
+        self.rows_written += data.shape[0]
+
+    def checkpoint(self):
+        # Write the directory as it stands, so that the strips written so far
+        # can be recovered if the process is interrupted.
+        if not TIFFCheckpointDirectory(self.tiff):
+            raise IOError("error writing checkpoint directory")
+
+    def end_page(self):
+        if self.shape is None:
+            raise RuntimeError("no page begun")
+        if self.rows_written != self.shape[0]:
+            raise ValueError("page incomplete: %d of %d rows written" %
+                             (self.rows_written, self.shape[0]))
+        self.shape = None
+        self._strip_buffer = None
+        if not TIFFWriteDirectory(self.tiff):
+            raise IOError("error writing directory")
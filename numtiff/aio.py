@@ -0,0 +1,145 @@
+# Copyright (c) 2011-2013 Mark A. Tsuchida
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# asyncio counterparts of the numtiff readers and writers (Python 3 only).
+#
+# LibTIFF calls run on a bounded thread pool, a band of strips at a time, so
+# that the event loop is never blocked and a cancelled task stops at the next
+# band. A TIFF handle is not thread-safe, so each call holds a lock for its
+# handle; calls on different handles run concurrently.
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+
+import numpy
+
+from . import (TiffStack, TiffWriter, _check_out, _check_region,
+               _image_format, page_info)
+from .libtiff import *
+from .libtiff import _handle_state
+
+# Each call on the executor decodes or encodes whole strips (or rows of
+# tiles) totalling at least this many bytes, to amortize the handoff.
+_band_bytes = 1 << 20
+
+_executor = None
+
+
+def set_executor(executor):
+    # Install executor (a concurrent.futures.Executor running threads, or
+    # None for the default) for all calls; return the previous executor.
+    global _executor
+    previous, _executor = _executor, executor
+    return previous
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(os.cpu_count() or 1)
+    return _executor
+
+
+def _handle_lock(tiff):
+    # The lock is kept with the handle's state, which TIFFClose drops.
+    # dict.setdefault is atomic, so only one lock is ever kept per handle.
+    state = _handle_state.setdefault(tiff.value, {})
+    return state.setdefault("lock", threading.Lock())
+
+
+async def _run(tiff, offset, func, *args, **kwargs):
+    # Run func(tiff, *args, **kwargs) on the executor, holding the lock of
+    # tiff, with the directory at offset (unless None) made current.
+    lock = _handle_lock(tiff)
+
+    def call():
+        with lock:
+            if offset is not None and \
+                    TIFFCurrentDirOffset(tiff).value != offset and \
+                    not TIFFSetSubDirectory(tiff, offset):
+                raise IOError("cannot read directory at offset %d" % offset)
+            return func(tiff, *args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), call)
+
+
+def _band_rows(block_rows, row_bytes):
+    # Rows per band: a multiple of block_rows adding up to _band_bytes.
+    return block_rows * max(1, _band_bytes // max(1, block_rows * row_bytes))
+
+
+async def _read_at(tiff, offset, region=None, out=None):
+    def prepare(tiff):
+        read, shape, dtype = _image_format(tiff)
+        return (TIFFCurrentDirOffset(tiff).value, read, shape, dtype,
+                page_info(tiff).block_rows)
+
+    offset, read, shape, dtype, block_rows = await _run(tiff, offset,
+                                                        prepare)
+    height, width = shape[:2]
+    y0, y1, x0, x1 = _check_region(region, height, width)
+    out = _check_out(out, (y1 - y0, x1 - x0) + shape[2:], dtype)
+
+    rows = _band_rows(min(block_rows, height),
+                      dtype.itemsize * int(numpy.prod(shape[1:])))
+    for lo in range(y0 - y0 % rows, y1, rows):
+        lo, hi = max(lo, y0), min(lo + rows, y1)
+        await _run(tiff, offset, read, region=(lo, hi, x0, x1),
+                   out=out[lo - y0:hi - y0])
+    return out
+
+
+async def aread_image(tiff, region=None, out=None):
+    # Read the current image (or region (y0, y1, x0, x1) of it) as the
+    # matching read_* function would.
+    return await _read_at(tiff, None, region, out)
+
+
+async def aiterate_stack(tiff, pages=None, region=None):
+    # Asynchronously yield the images of the pages of tiff (by default, all).
+    stack = TiffStack(tiff)
+    offsets = await _run(tiff, None, lambda tiff: stack.index)
+    if pages is None:
+        pages = range(len(offsets))
+    for page in pages:
+        yield await _read_at(tiff, int(offsets[page]), region)
+
+
+async def awrite_image(tiff, image, multiplane=False, compression=None,
+                       rows_per_strip=None, bits_per_sample=None):
+    # Write a gray or RGB image as a new page, as TiffWriter would. If the
+    # task is cancelled, the page is left unfinished.
+    image = numpy.asarray(image)
+    writer = TiffWriter(tiff)
+
+    def begin_page(tiff):
+        writer.begin_page(image.shape, image.dtype, multiplane, compression,
+                          rows_per_strip, bits_per_sample)
+        return page_info(tiff).rows_per_strip
+
+    strip_rows = await _run(tiff, None, begin_page)
+    rows = _band_rows(strip_rows, image[:1].nbytes)
+    for lo in range(0, image.shape[0], rows):
+        await _run(tiff, None, lambda tiff, band: writer.write_rows(band),
+                   image[lo:lo + rows])
+    await _run(tiff, None, lambda tiff: writer.end_page())
@@ -0,0 +1,89 @@
+# Copyright (c) 2011-2013 Mark A. Tsuchida
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Regenerate tiffconst.py from the installed tiff.h.
+#
+# Usage: python -m numtiff.gentiffconst [path/to/tiff.h]
+#
+# This is only needed when adding constants from a newer LibTIFF; numtiff
+# itself never reads tiff.h.
+
+import ctypes.util
+import numbers
+import os.path
+import sys
+
+
+def find_tiff_dot_h():
+    # This will likely work on Mac OS X:
+    libtiff_path = ctypes.util.find_library("tiff") or ""
+    tiff_include_path = os.path.join(os.path.dirname(libtiff_path), "..",
+                                     "include")
+    # On Linux, libtiff_path might just be a filename (like libtiff.so). I'm
+    # not sure what the proper way is to locate the corresponding include
+    # path, but for now we search some candidates:
+    possible_include_paths = [tiff_include_path,
+                              "/usr/local/include",
+                              "/usr/include"]
+    for path in possible_include_paths:
+        tiff_dot_h = os.path.join(path, "tiff.h")
+        if os.path.exists(tiff_dot_h):
+            return tiff_dot_h
+    raise RuntimeError("cannot locate tiff.h")
+
+
+# Scan tiff.h to extract constant definitions, in order of appearance.
+def tiff_tag_constants(tiff_dot_h):
+    names = []
+    macros = {}
+    with open(tiff_dot_h) as f:
+        for line in f:
+            words = line.split()
+            if len(words) >= 3 and words[0] == "#define":
+                name = words[1]
+                value = " ".join(words[2:]).split("/*", 1)[0].strip()
+                # Python syntax is close enough to C for this purpose.
+                try:
+                    value = eval(value, {"__builtins__": {}}, macros)
+                except (SyntaxError, NameError, TypeError):
+                    continue
+                if (isinstance(value, numbers.Integral) and
+                        name not in macros):
+                    names.append(name)
+                macros[name] = value
+    return [(name, macros[name]) for name in names]
+
+
+def write_constants(constants, file):
+    file.write("# Constants from tiff.h, generated by gentiffconst.py. "
+               "Do not edit.\n\n")
+    for name, value in constants:
+        file.write("%s = %d\n" % (name, value))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        tiff_dot_h = sys.argv[1]
+    else:
+        tiff_dot_h = find_tiff_dot_h()
+    output = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "tiffconst.py")
+    with open(output, "w") as f:
+        write_constants(tiff_tag_constants(tiff_dot_h), f)
@@ -21,7 +21,6 @@
 import ctypes
 import ctypes.util
 import os
-import os.path
 
 from ctypes import c_void_p, c_char_p, POINTER, byref
 from ctypes import c_int, c_long, c_ulong, c_ssize_t
@@ -40,40 +39,33 @@ except AttributeError:
     has_bigtiff = False # LibTIFF version < 4.0.0.
 
 
-# Find tiff.h, which contains #defines for constants.
-
-# This will likely work on Mac OS X:
-tiff_include_path = os.path.join(os.path.dirname(libtiff_path), "..", "include")
-# On Linux, libtiff_path might just be a filename (like libtiff.so). I'm not
-# sure what the proper way is to locate the corresponding include path, but for
-# now we search some candidates:
-possible_include_paths = [tiff_include_path,
-                          "/usr/local/include",
-                          "/usr/include"]
-for path in possible_include_paths:
-    tiff_dot_h = os.path.join(path, "tiff.h")
-    if os.path.exists(tiff_dot_h):
-        break
-else:
-    raise RuntimeError("cannot locate tiff.h")
+# LibTIFF functions are looked up and given their prototypes on first call,
+# so that importing this module stays cheap and functions missing from the
+# loaded LibTIFF version only fail when used.
+class _Function(object):
+    __slots__ = ("name", "argtypes", "restype", "_func")
+
+    def __init__(self, name, argtypes, restype):
+        self.name = name
+        self.argtypes = argtypes
+        self.restype = restype
+        self._func = None
+
+    def __call__(self, *args):
+        func = self._func
+        if func is None:
+            func = getattr(libtiff, self.name)
+            func.argtypes = self.argtypes
+            func.restype = self.restype
+            self._func = func
+        return func(*args)
 
+    def __repr__(self):
+        return "<LibTIFF function %s>" % self.name
 
-# Scan tiff.h to extract constant definitions.
-def _tiff_tag_constants(tiff_dot_h):
-    macros = {}
-    with open(tiff_dot_h) as f:
-        for line in f:
-            words = line.split()
-            if len(words) and words[0] == "#define":
-                if len(words) >= 3:
-                    name = words[1]
-                    value = " ".join(words[2:]).split("/*", 1)[0].strip()
-                    # Python syntax is close enough to C for this purpose.
-                    macros[name] = eval(value, macros.copy())
-    return macros
 
-for name, value in _tiff_tag_constants(tiff_dot_h).iteritems():
-    exec("%s = %d\n" % (name, value), globals(), locals())
+# Constants #defined in tiff.h, pregenerated by gentiffconst.py.
+from .tiffconst import *
 
 
 # Types defined in tiffio.h.
@@ -133,6 +125,7 @@ _tiff_field_types = \
     TIFFTAG_JPEGQUALITY: (c_int,),
     TIFFTAG_JPEGTABLES: (c_uint32, c_void_p),
     TIFFTAG_JPEGTABLESMODE: (c_int,),
+    TIFFTAG_LZMAPRESET: (c_int,), # codec pseudo-tag
     TIFFTAG_MAKE: (c_char_p,),
     TIFFTAG_MATTEING: (c_uint16,),
     TIFFTAG_MAXSAMPLEVALUE: (c_uint16,),
@@ -161,16 +154,19 @@ _tiff_field_types = \
     TIFFTAG_STRIPOFFSETS: (POINTER(c_uint64 if has_bigtiff
                                    else c_uint32),), # readonly
     TIFFTAG_SUBFILETYPE: (c_uint32,),
-    TIFFTAG_SUBIFD: (c_uint16, POINTER(c_uint32)),
+    TIFFTAG_SUBIFD: (c_uint16, POINTER(c_uint64 if has_bigtiff
+                                       else c_uint32)),
     TIFFTAG_TARGETPRINTER: (c_char_p,),
     TIFFTAG_THRESHHOLDING: (c_uint16,),
-    TIFFTAG_TILEBYTECOUNTS: ((c_uint64 if has_bigtiff else c_uint32),),
+    TIFFTAG_TILEBYTECOUNTS: (POINTER(c_uint64 if has_bigtiff
+                                     else c_uint32),), # readonly
     TIFFTAG_TILEDEPTH: (c_uint32,),
     TIFFTAG_TILELENGTH: (c_uint32,),
     TIFFTAG_TILEOFFSETS: (POINTER(c_uint64 if has_bigtiff
                                   else c_uint32),), # readonly
     TIFFTAG_TILEWIDTH: (c_uint32,),
     TIFFTAG_TRANSFERFUNCTION: (POINTER(c_uint16),) * 3, # or * 1
+    TIFFTAG_WEBP_LEVEL: (c_int,), # codec pseudo-tag
     TIFFTAG_WHITEPOINT: (POINTER(c_float),),
     TIFFTAG_XMLPACKET: (c_uint32, c_void_p),
     TIFFTAG_XPOSITION: (c_float,),
@@ -180,18 +176,24 @@ _tiff_field_types = \
     TIFFTAG_YCBCRSUBSAMPLING: (c_uint16,) * 2,
     TIFFTAG_YPOSITION: (c_float,),
     TIFFTAG_YRESOLUTION: (c_float,),
+    TIFFTAG_ZIPQUALITY: (c_int,), # codec pseudo-tag
+    TIFFTAG_ZSTD_LEVEL: (c_int,), # codec pseudo-tag
 }
 
 
 # man 3 TIFFClose
-TIFFClose = libtiff.TIFFClose
-TIFFClose.argtypes = [c_TIFF_p]
-TIFFClose.restype = None
+_TIFFClose = _Function("TIFFClose", [c_TIFF_p], None)
+
+# State that numtiff attaches to an open handle, by handle address. It is
+# dropped on close, since a later handle may be allocated at the same address.
+_handle_state = {}
+
+def TIFFClose(tiff):
+    _handle_state.pop(tiff.value, None)
+    _TIFFClose(tiff)
 
 # man 3 TIFFDataWidth
-TIFFDataWidth = libtiff.TIFFDataWidth
-TIFFDataWidth.argtypes = [c_int]
-TIFFDataWidth.restype = c_int
+TIFFDataWidth = _Function("TIFFDataWidth", [c_int], c_int)
 
 # man 3 TIFFError
 # Support only turning errors on and off.
@@ -206,133 +208,165 @@ def show_errors(flag):
 # Not supporting.
 
 # man 3 TIFFFlush
-TIFFFlush = libtiff.TIFFFlush
-TIFFFlush.argtypes = [c_TIFF_p]
-TIFFFlush.restype = c_int
+TIFFFlush = _Function("TIFFFlush", [c_TIFF_p], c_int)
 
-TIFFFlushData = libtiff.TIFFFlushData
-TIFFFlushData.argtypes = [c_TIFF_p]
-TIFFFlushData.restype = c_int
+TIFFFlushData = _Function("TIFFFlushData", [c_TIFF_p], c_int)
 
 # man 3 TIFFGetField
-def _TIFFGetField(func, tiff, tag, *args):
-    func.argtypes = [c_TIFF_p, c_ttag_t] + [POINTER(t) for t
-                                            in _tiff_field_types[tag]]
-    ret = func(tiff, tag, *args)
-    func.argtypes = None
+# TIFFGetField() and TIFFSetField() are variadic, so they are called through
+# separate function objects with fixed argument types, one per distinct
+# signature. Indexing the library (as opposed to attribute access) returns a
+# new function object each time, so the argtypes are never shared or
+# modified after binding and the functions can be called from any thread.
+_field_functions = {}
+_field_signatures = {}
+
+def _field_function(name, tag):
+    try:
+        return _field_functions[(name, tag)]
+    except KeyError:
+        pass
+    if name == "TIFFSetField":
+        # All 'float' parameters in the variable arguments are to be
+        # promoted to double by the C compiler. Note that the same does NOT
+        # apply to TIFFGetField().
+        field_types = tuple((c_double if t is c_float else t) for t in
+                            _tiff_field_types[tag])
+    else:
+        field_types = tuple(POINTER(t) for t in _tiff_field_types[tag])
+    func = _field_signatures.get((name, field_types))
+    if func is None:
+        func = libtiff[name]
+        func.argtypes = [c_TIFF_p, c_ttag_t] + list(field_types)
+        func.restype = c_int
+        func = _field_signatures.setdefault((name, field_types), func)
+    return _field_functions.setdefault((name, tag), func)
 
-libtiff.TIFFGetField.restype = c_int
 def TIFFGetField(tiff, tag, *args):
-    return _TIFFGetField(libtiff.TIFFGetField, tiff, tag, *args)
+    return _field_function("TIFFGetField", tag)(tiff, tag, *args)
 
-libtiff.TIFFGetFieldDefaulted.restype = c_int
 def TIFFGetFieldDefaulted(tiff, tag, *args):
-    return _TIFFGetField(libtiff.TIFFGetFieldDefaulted, tiff, tag, *args)
+    return _field_function("TIFFGetFieldDefaulted", tag)(tiff, tag, *args)
 
 # man 3 TIFFOpen
-TIFFOpen = libtiff.TIFFOpen
-TIFFOpen.argtypes = [c_char_p, c_char_p]
-TIFFOpen.restype = c_TIFF_p
-
-TIFFFdOpen = libtiff.TIFFFdOpen
-TIFFFdOpen.argtypes = [c_int, c_char_p, c_char_p]
-TIFFFdOpen.restype = c_TIFF_p
-
-# Not supporting: TIFFClientOpen.
+TIFFOpen = _Function("TIFFOpen", [c_char_p, c_char_p], c_TIFF_p)
+
+TIFFFdOpen = _Function("TIFFFdOpen", [c_int, c_char_p, c_char_p], c_TIFF_p)
+
+# The callback prototypes use the fundamental types of tsize_t and toff_t, so
+# that the procedures receive and return plain integers.
+_c_tsize = c_ssize_t if has_bigtiff else c_uint32
+_c_toff = c_uint64 if has_bigtiff else c_uint32
+TIFFReadWriteProc = ctypes.CFUNCTYPE(_c_tsize, c_void_p, c_void_p, _c_tsize)
+TIFFSeekProc = ctypes.CFUNCTYPE(_c_toff, c_void_p, _c_toff, c_int)
+TIFFCloseProc = ctypes.CFUNCTYPE(c_int, c_void_p)
+TIFFSizeProc = ctypes.CFUNCTYPE(_c_toff, c_void_p)
+TIFFMapFileProc = ctypes.CFUNCTYPE(c_int, c_void_p, POINTER(c_void_p),
+                                   POINTER(_c_toff))
+TIFFUnmapFileProc = ctypes.CFUNCTYPE(None, c_void_p, c_void_p, _c_toff)
+TIFFClientOpen = _Function("TIFFClientOpen",
+                           [c_char_p, c_char_p, c_void_p, TIFFReadWriteProc,
+                            TIFFReadWriteProc, TIFFSeekProc, TIFFCloseProc,
+                            TIFFSizeProc, TIFFMapFileProc, TIFFUnmapFileProc],
+                           c_TIFF_p)
 
 # man 3 TIFFPrintDirectory
 class c_FILE_p(c_void_p): pass
-libtiff.TIFFPrintDirectory.argtypes = [c_TIFF_p, c_FILE_p, c_long]
-libtiff.TIFFPrintDirectory.restype = None
-PyFile_AsFile = ctypes.pythonapi.PyFile_AsFile
-PyFile_AsFile.argtypes = [ctypes.py_object]
-PyFile_AsFile.restype = c_FILE_p
+_TIFFPrintDirectory = _Function("TIFFPrintDirectory",
+                                [c_TIFF_p, c_FILE_p, c_long], None)
+try:
+    PyFile_AsFile = ctypes.pythonapi.PyFile_AsFile
+    PyFile_AsFile.argtypes = [ctypes.py_object]
+    PyFile_AsFile.restype = c_FILE_p
+except AttributeError: # Python 3 file objects do not wrap a FILE *.
+    PyFile_AsFile = None
+    _libc = ctypes.CDLL(ctypes.util.find_library("c"))
+    _fdopen = _libc.fdopen
+    _fdopen.argtypes = [c_int, c_char_p]
+    _fdopen.restype = c_FILE_p
+    _fclose = _libc.fclose
+    _fclose.argtypes = [c_FILE_p]
+    _fclose.restype = c_int
 def TIFFPrintDirectory(tiff, file, flags=0):
-    fp = PyFile_AsFile(file)
-    libtiff.TIFFPrintDirectory(tiff, fp, flags)
+    if PyFile_AsFile is not None:
+        _TIFFPrintDirectory(tiff, PyFile_AsFile(file), flags)
+        return
+    # Print to a C stream on a duplicate of the file's descriptor, after
+    # anything already buffered by Python.
+    file.flush()
+    fd = os.dup(file.fileno())
+    fp = _fdopen(fd, b"a")
+    if not fp:
+        os.close(fd)
+        raise OSError(ctypes.get_errno(), "fdopen failed")
+    try:
+        _TIFFPrintDirectory(tiff, fp, flags)
+    finally:
+        _fclose(fp) # Also closes fd.
 
 # man 3 TIFFRGBAImage
 # Not supporting (use TIFFReadRGBAImage(3)).
 
 # man 3 TIFFReadDirectory
-TIFFReadDirectory = libtiff.TIFFReadDirectory
-TIFFReadDirectory.argtypes = [c_TIFF_p]
-TIFFReadDirectory.restype = c_int
+TIFFReadDirectory = _Function("TIFFReadDirectory", [c_TIFF_p], c_int)
 
 # man 3 TIFFReadEncodedStrip
-TIFFReadEncodedStrip = libtiff.TIFFReadEncodedStrip
-TIFFReadEncodedStrip.argtypes = [c_TIFF_p, c_tstrip_t, c_tdata_t, c_tsize_t]
-TIFFReadEncodedStrip.restype = c_tsize_t
+TIFFReadEncodedStrip = _Function("TIFFReadEncodedStrip",
+                                 [c_TIFF_p, c_tstrip_t, c_tdata_t, c_tsize_t],
+                                 c_tsize_t)
 
 # man 3 TIFFReadEncodedTile
-TIFFReadEncodedTile = libtiff.TIFFReadEncodedTile
-TIFFReadEncodedTile.argtypes = [c_TIFF_p, c_ttile_t, c_tdata_t, c_tsize_t]
-TIFFReadEncodedTile.restype = c_int
+TIFFReadEncodedTile = _Function("TIFFReadEncodedTile",
+                                [c_TIFF_p, c_ttile_t, c_tdata_t, c_tsize_t],
+                                c_tsize_t)
 
 # man 3 TIFFReadRGBAImage
-TIFFReadRGBAImage = libtiff.TIFFReadRGBAImage
-TIFFReadRGBAImage.argtypes = [c_TIFF_p, c_uint32, c_uint32, POINTER(c_uint32),
-                              c_int]
-TIFFReadRGBAImage.restype = c_int
+TIFFReadRGBAImage = _Function("TIFFReadRGBAImage",
+                              [c_TIFF_p, c_uint32, c_uint32, POINTER(c_uint32),
+                               c_int], c_int)
 
-TIFFReadRGBAImageOriented = libtiff.TIFFReadRGBAImageOriented
-TIFFReadRGBAImageOriented.argtypes = [c_TIFF_p, c_uint32, c_uint32,
-                                      POINTER(c_uint32), c_int, c_int]
-TIFFReadRGBAImageOriented.restype = c_int
+TIFFReadRGBAImageOriented = _Function("TIFFReadRGBAImageOriented",
+                                      [c_TIFF_p, c_uint32, c_uint32,
+                                       POINTER(c_uint32), c_int, c_int], c_int)
 
 # man 3 TIFFReadRGBAStrip
-TIFFReadRGBAStrip = libtiff.TIFFReadRGBAStrip
-TIFFReadRGBAStrip.argtypes = [c_TIFF_p, c_uint32, POINTER(c_uint32)]
-TIFFReadRGBAStrip.restype = c_int
+TIFFReadRGBAStrip = _Function("TIFFReadRGBAStrip",
+                              [c_TIFF_p, c_uint32, POINTER(c_uint32)], c_int)
 
 # man 3 TIFFReadRGBATile
-TIFFReadRGBATile = libtiff.TIFFReadRGBATile
-TIFFReadRGBATile.argtypes = [c_TIFF_p, c_uint32, c_uint32, POINTER(c_uint32)]
-TIFFReadRGBATile.restype = c_int
+TIFFReadRGBATile = _Function("TIFFReadRGBATile",
+                             [c_TIFF_p, c_uint32, c_uint32, POINTER(c_uint32)],
+                             c_int)
 
 # man 3 TIFFReadRawStrip
-TIFFReadRawStrip = libtiff.TIFFReadRawStrip
-TIFFReadRawStrip.argtypes = [c_TIFF_p, c_tstrip_t, c_tdata_t, c_tsize_t]
-TIFFReadRawStrip.restype = c_tsize_t
+TIFFReadRawStrip = _Function("TIFFReadRawStrip",
+                             [c_TIFF_p, c_tstrip_t, c_tdata_t, c_tsize_t],
+                             c_tsize_t)
 
 # man 3 TIFFReadRawTile
-TIFFReadRawTile = libtiff.TIFFReadRawTile
-TIFFReadRawTile.argtypes = [c_TIFF_p, c_ttile_t, c_tdata_t, c_tsize_t]
-TIFFReadRawTile.restype = c_tsize_t
+TIFFReadRawTile = _Function("TIFFReadRawTile",
+                            [c_TIFF_p, c_ttile_t, c_tdata_t, c_tsize_t],
+                            c_tsize_t)
 
 # man 3 TIFFReadScanline
-TIFFReadScanline = libtiff.TIFFReadScanline
-TIFFReadScanline.argtypes = [c_TIFF_p, c_tdata_t, c_uint32, c_tsample_t]
-TIFFReadScanline.restype = c_int
+TIFFReadScanline = _Function("TIFFReadScanline",
+                             [c_TIFF_p, c_tdata_t, c_uint32, c_tsample_t],
+                             c_int)
 
 # man 3 TIFFReadTile
-TIFFReadTile = libtiff.TIFFReadTile
-TIFFReadTile.argtypes = [c_TIFF_p, c_tdata_t, c_uint32, c_uint32, c_uint32,
-                         c_tsample_t]
-TIFFReadTile.restype = c_tsize_t
+TIFFReadTile = _Function("TIFFReadTile",
+                         [c_TIFF_p, c_tdata_t, c_uint32, c_uint32, c_uint32,
+                          c_tsample_t], c_tsize_t)
 
 # man 3 TIFFSetDirectory
-TIFFSetDirectory = libtiff.TIFFSetDirectory
-TIFFSetDirectory.argtypes = [c_TIFF_p, c_tdir_t]
-TIFFSetDirectory.restype = c_int
+TIFFSetDirectory = _Function("TIFFSetDirectory", [c_TIFF_p, c_tdir_t], c_int)
 
-TIFFSetSubDirectory = libtiff.TIFFSetSubDirectory
-TIFFSetSubDirectory.argtypes = [c_TIFF_p, c_uint32]
-TIFFSetSubDirectory.restype = c_int
+TIFFSetSubDirectory = _Function("TIFFSetSubDirectory",
+                                [c_TIFF_p, c_toff_t], c_int)
 
 # man 3 TIFFSetField
-libtiff.TIFFSetField.restype = c_int
 def TIFFSetField(tiff, tag, *args):
-    func = libtiff.TIFFSetField
-    # All 'float' parameters in the variable arguments are to be promoted to
-    # double by the C compiler. Note that the same does NOT apply to
-    # TIFFGetField().
-    field_types = [(c_double if t is c_float else t) for t in
-                   _tiff_field_types[tag]]
-    func.argtypes = [c_TIFF_p, c_ttag_t] + field_types
-    ret = func(tiff, tag, *args)
-    func.argtypes = None
-    return ret
+    return _field_function("TIFFSetField", tag)(tiff, tag, *args)
 
 # man 3 TIFFWarning
 # Support only turning warnings on and off.
@@ -344,54 +378,49 @@ def show_warnings(flag):
         libtiff.TIFFSetWarningHandler(c_void_p(0))
 
 # man 3 TIFFWriteDirectory
-TIFFWriteDirectory = libtiff.TIFFWriteDirectory
-TIFFWriteDirectory.argtypes = [c_TIFF_p]
-TIFFWriteDirectory.restype = c_int
+TIFFWriteDirectory = _Function("TIFFWriteDirectory", [c_TIFF_p], c_int)
 
-TIFFRewriteDirectory = libtiff.TIFFRewriteDirectory
-TIFFRewriteDirectory.argtypes = [c_TIFF_p]
-TIFFRewriteDirectory.restype = c_int
+TIFFRewriteDirectory = _Function("TIFFRewriteDirectory", [c_TIFF_p], c_int)
 
-TIFFCheckpointDirectory = libtiff.TIFFCheckpointDirectory
-TIFFCheckpointDirectory.argtypes = [c_TIFF_p]
-TIFFCheckpointDirectory.restype = c_int
+TIFFCheckpointDirectory = _Function("TIFFCheckpointDirectory",
+                                    [c_TIFF_p], c_int)
 
 # man 3 TIFFWriteEncodedStrip
-TIFFWriteEncodedStrip = libtiff.TIFFWriteEncodedStrip
-TIFFWriteEncodedStrip.argtypes = [c_TIFF_p, c_tstrip_t, c_tdata_t, c_tsize_t]
-TIFFWriteEncodedStrip.restype = c_tsize_t
+TIFFWriteEncodedStrip = _Function("TIFFWriteEncodedStrip",
+                                  [c_TIFF_p, c_tstrip_t, c_tdata_t, c_tsize_t],
+                                  c_tsize_t)
 
 # man 3 TIFFWriteEncodedTile
-TIFFWriteEncodedTile = libtiff.TIFFWriteEncodedTile
-TIFFWriteEncodedTile.argtypes = [c_TIFF_p, c_ttile_t, c_tdata_t, c_tsize_t]
-TIFFWriteEncodedTile.restype = c_tsize_t
+TIFFWriteEncodedTile = _Function("TIFFWriteEncodedTile",
+                                 [c_TIFF_p, c_ttile_t, c_tdata_t, c_tsize_t],
+                                 c_tsize_t)
 
 # man 3 TIFFWriteRawStrip
-TIFFWriteRawStrip = libtiff.TIFFWriteRawStrip
-TIFFWriteRawStrip.argtypes = [c_TIFF_p, c_tstrip_t, c_tdata_t, c_tsize_t]
-TIFFWriteRawStrip.restype = c_tsize_t
+TIFFWriteRawStrip = _Function("TIFFWriteRawStrip",
+                              [c_TIFF_p, c_tstrip_t, c_tdata_t, c_tsize_t],
+                              c_tsize_t)
 
 # man 3 TIFFWriteRawTile
-TIFFWriteRawTile = libtiff.TIFFWriteRawTile
-TIFFWriteRawTile.argtypes = [c_TIFF_p, c_ttile_t, c_tdata_t, c_tsize_t]
-TIFFWriteRawTile.restype = c_tsize_t
+TIFFWriteRawTile = _Function("TIFFWriteRawTile",
+                             [c_TIFF_p, c_ttile_t, c_tdata_t, c_tsize_t],
+                             c_tsize_t)
 
 # man 3 TIFFWriteScanline
-TIFFWriteScanline = libtiff.TIFFWriteScanline
-TIFFWriteScanline.argtypes = [c_TIFF_p, c_tdata_t, c_uint32, c_tsample_t]
-TIFFWriteScanline.restype = c_int
+TIFFWriteScanline = _Function("TIFFWriteScanline",
+                              [c_TIFF_p, c_tdata_t, c_uint32, c_tsample_t],
+                              c_int)
 
 # man 3 TIFFWriteTile
-TIFFWriteTile = libtiff.TIFFWriteTile
-TIFFWriteTile.argtypes = [c_TIFF_p, c_tdata_t, c_uint32, c_uint32, c_uint32,
-                          c_tsample_t]
-TIFFWriteTile.restype = c_tsize_t
+TIFFWriteTile = _Function("TIFFWriteTile",
+                          [c_TIFF_p, c_tdata_t, c_uint32, c_uint32, c_uint32,
+                           c_tsample_t], c_tsize_t)
 
 # man 3 TIFFbuffer
 # Not supporting.
 
 # man 3 TIFFcodec
-# Not supporting.
+# Only supporting the query (codecs cannot be registered from Python).
+TIFFIsCODECConfigured = _Function("TIFFIsCODECConfigured", [c_uint16], c_int)
 
 # man 3 TIFFcolor
 # Not supporting.
@@ -400,145 +429,90 @@ TIFFWriteTile.restype = c_tsize_t
 # Not supporting.
 
 # man 3 TIFFquery
-TIFFCurrentRow = libtiff.TIFFCurrentRow
-TIFFCurrentRow.argtypes = [c_TIFF_p]
-TIFFCurrentRow.restype = c_uint32
+TIFFCurrentRow = _Function("TIFFCurrentRow", [c_TIFF_p], c_uint32)
+
+TIFFCurrentStrip = _Function("TIFFCurrentStrip", [c_TIFF_p], c_tstrip_t)
 
-TIFFCurrentStrip = libtiff.TIFFCurrentStrip
-TIFFCurrentStrip.argtypes = [c_TIFF_p]
-TIFFCurrentStrip.restype = c_tstrip_t
+TIFFCurrentTile = _Function("TIFFCurrentTile", [c_TIFF_p], c_ttile_t)
 
-TIFFCurrentTile = libtiff.TIFFCurrentTile
-TIFFCurrentTile.argtypes = [c_TIFF_p]
-TIFFCurrentTile.restype = c_ttile_t
+TIFFCurrentDirectory = _Function("TIFFCurrentDirectory", [c_TIFF_p], c_tdir_t)
 
-TIFFCurrentDirectory = libtiff.TIFFCurrentDirectory
-TIFFCurrentDirectory.argtypes = [c_TIFF_p]
-TIFFCurrentDirectory.restype = c_tdir_t
+TIFFCurrentDirOffset = _Function("TIFFCurrentDirOffset", [c_TIFF_p], c_toff_t)
 
-TIFFLastDirectory = libtiff.TIFFLastDirectory
-TIFFLastDirectory.argtypes = [c_TIFF_p]
-TIFFLastDirectory.restype = c_int
+TIFFLastDirectory = _Function("TIFFLastDirectory", [c_TIFF_p], c_int)
 
-TIFFFileno = libtiff.TIFFFileno
-TIFFFileno.argtypes = [c_TIFF_p]
-TIFFFileno.restype = c_int
+TIFFFileno = _Function("TIFFFileno", [c_TIFF_p], c_int)
 
-TIFFFileName = libtiff.TIFFFileName
-TIFFFileName.argtypes = [c_TIFF_p]
-TIFFFileName.restype = c_char_p
+TIFFFileName = _Function("TIFFFileName", [c_TIFF_p], c_char_p)
 
-TIFFGetMode = libtiff.TIFFGetMode
-TIFFGetMode.argtypes = [c_TIFF_p]
-TIFFGetMode.restype = c_int
+TIFFGetMode = _Function("TIFFGetMode", [c_TIFF_p], c_int)
 
-TIFFIsTiled = libtiff.TIFFIsTiled
-TIFFIsTiled.argtypes = [c_TIFF_p]
-TIFFIsTiled.restype = c_int
+TIFFIsTiled = _Function("TIFFIsTiled", [c_TIFF_p], c_int)
 
-TIFFIsByteSwapped = libtiff.TIFFIsByteSwapped
-TIFFIsByteSwapped.argtypes = [c_TIFF_p]
-TIFFIsByteSwapped.restype = c_int
+TIFFIsByteSwapped = _Function("TIFFIsByteSwapped", [c_TIFF_p], c_int)
 
-TIFFIsUpSampled = libtiff.TIFFIsUpSampled
-TIFFIsUpSampled.argtypes = [c_TIFF_p]
-TIFFIsUpSampled.restype = c_int
+TIFFIsUpSampled = _Function("TIFFIsUpSampled", [c_TIFF_p], c_int)
 
-TIFFIsMSB2LSB = libtiff.TIFFIsMSB2LSB
-TIFFIsMSB2LSB.argtypes = [c_TIFF_p]
-TIFFIsMSB2LSB.restype = c_int
+TIFFIsMSB2LSB = _Function("TIFFIsMSB2LSB", [c_TIFF_p], c_int)
 
-TIFFGetVersion = libtiff.TIFFGetVersion
-TIFFGetVersion.argtypes = []
-TIFFGetVersion.restype = c_char_p
+TIFFGetVersion = _Function("TIFFGetVersion", [], c_char_p)
 
 # man 3 TIFFsize
-TIFFRasterScanlineSize = libtiff.TIFFRasterScanlineSize
-TIFFRasterScanlineSize.argtypes = [c_TIFF_p]
-TIFFRasterScanlineSize.restype = c_tsize_t
+TIFFRasterScanlineSize = _Function("TIFFRasterScanlineSize",
+                                   [c_TIFF_p], c_tsize_t)
 
-TIFFScanlineSize = libtiff.TIFFScanlineSize
-TIFFScanlineSize.argtypes = [c_TIFF_p]
-TIFFScanlineSize.restype = c_tsize_t
+TIFFScanlineSize = _Function("TIFFScanlineSize", [c_TIFF_p], c_tsize_t)
 
 # man 3 TIFFstrip
-TIFFDefaultStripSize = libtiff.TIFFDefaultStripSize
-TIFFDefaultStripSize.argtypes = [c_TIFF_p, c_uint32]
-TIFFDefaultStripSize.restype = c_uint32
+TIFFDefaultStripSize = _Function("TIFFDefaultStripSize",
+                                 [c_TIFF_p, c_uint32], c_uint32)
 
-TIFFStripSize = libtiff.TIFFStripSize
-TIFFStripSize.argtypes = [c_TIFF_p]
-TIFFStripSize.restype = c_tsize_t
+TIFFStripSize = _Function("TIFFStripSize", [c_TIFF_p], c_tsize_t)
 
-TIFFVStripSize = libtiff.TIFFVStripSize
-TIFFVStripSize.argtypes = [c_TIFF_p, c_uint32]
-TIFFVStripSize.restype = c_tsize_t
+TIFFVStripSize = _Function("TIFFVStripSize", [c_TIFF_p, c_uint32], c_tsize_t)
 
-TIFFRawStripSize = libtiff.TIFFRawStripSize
-TIFFRawStripSize.argtypes = [c_TIFF_p, c_tstrip_t]
-TIFFRawStripSize.restype = c_tsize_t
+TIFFRawStripSize = _Function("TIFFRawStripSize",
+                             [c_TIFF_p, c_tstrip_t], c_tsize_t)
 
-TIFFComputeStrip = libtiff.TIFFComputeStrip
-TIFFComputeStrip.argtypes = [c_TIFF_p, c_uint32, c_tsample_t]
-TIFFComputeStrip.restype = c_tstrip_t
+TIFFComputeStrip = _Function("TIFFComputeStrip",
+                             [c_TIFF_p, c_uint32, c_tsample_t], c_tstrip_t)
 
-TIFFNumberOfStrips = libtiff.TIFFNumberOfStrips
-TIFFNumberOfStrips.argtypes = [c_TIFF_p]
-TIFFNumberOfStrips.restype = c_tstrip_t
+TIFFNumberOfStrips = _Function("TIFFNumberOfStrips", [c_TIFF_p], c_tstrip_t)
 
 # man 3 TIFFswab
-TIFFGetBitRevTable = libtiff.TIFFGetBitRevTable
-TIFFGetBitRevTable.argtypes = [c_int]
-TIFFGetBitRevTable.restype = POINTER(c_uint8)
+TIFFGetBitRevTable = _Function("TIFFGetBitRevTable", [c_int], POINTER(c_uint8))
 
-TIFFReverseBits = libtiff.TIFFReverseBits
-TIFFReverseBits.argtypes = [c_uint8, c_ulong]
-TIFFReverseBits.restype = None
+TIFFReverseBits = _Function("TIFFReverseBits", [c_uint8, c_ulong], None)
 
-TIFFSwabShort = libtiff.TIFFSwabShort
-TIFFSwabShort.argtypes = [POINTER(c_uint16)]
-TIFFSwabShort.restype = None
+TIFFSwabShort = _Function("TIFFSwabShort", [POINTER(c_uint16)], None)
 
-TIFFSwabLong = libtiff.TIFFSwabLong
-TIFFSwabLong.argtypes = [POINTER(c_uint32)]
-TIFFSwabLong.restype = None
+TIFFSwabLong = _Function("TIFFSwabLong", [POINTER(c_uint32)], None)
 
-TIFFSwabArrayOfShort = libtiff.TIFFSwabArrayOfShort
-TIFFSwabArrayOfShort.argtypes = [POINTER(c_uint16), c_ulong]
-TIFFSwabArrayOfShort.restype = None
+TIFFSwabArrayOfShort = _Function("TIFFSwabArrayOfShort",
+                                 [POINTER(c_uint16), c_ulong], None)
 
-TIFFSwabArrayOfLong = libtiff.TIFFSwabArrayOfLong
-TIFFSwabArrayOfLong.argtypes = [POINTER(c_uint32), c_ulong]
-TIFFSwabArrayOfLong.restype = None
+TIFFSwabArrayOfLong = _Function("TIFFSwabArrayOfLong",
+                                [POINTER(c_uint32), c_ulong], None)
 
 # man 3 TIFFtile
 
-TIFFDefaultTileSize = libtiff.TIFFDefaultTileSize
-TIFFDefaultTileSize.argtypes = [c_TIFF_p, POINTER(c_uint32), POINTER(c_uint32)]
-TIFFDefaultTileSize.restype = None
+TIFFDefaultTileSize = _Function("TIFFDefaultTileSize",
+                                [c_TIFF_p, POINTER(c_uint32),
+                                 POINTER(c_uint32)], None)
 
-TIFFTileSize = libtiff.TIFFTileSize
-TIFFTileSize.argtypes = [c_TIFF_p]
-TIFFTileSize.restype = c_tsize_t
+TIFFTileSize = _Function("TIFFTileSize", [c_TIFF_p], c_tsize_t)
 
-TIFFTileRowSize = libtiff.TIFFTileRowSize
-TIFFTileRowSize.argtypes = [c_TIFF_p]
-TIFFTileRowSize.restype = c_tsize_t
+TIFFTileRowSize = _Function("TIFFTileRowSize", [c_TIFF_p], c_tsize_t)
 
-TIFFVTileSize = libtiff.TIFFVTileSize
-TIFFVTileSize.argtypes = [c_TIFF_p, c_uint32]
-TIFFVTileSize.restype = c_tsize_t
+TIFFVTileSize = _Function("TIFFVTileSize", [c_TIFF_p, c_uint32], c_tsize_t)
 
-TIFFComputeTile = libtiff.TIFFComputeTile
-TIFFComputeTile.argtypes = [c_TIFF_p, c_uint32, c_uint32, c_uint32,
-                            c_tsample_t]
-TIFFComputeTile.restype = c_ttile_t
+TIFFComputeTile = _Function("TIFFComputeTile",
+                            [c_TIFF_p, c_uint32, c_uint32, c_uint32,
+                             c_tsample_t], c_ttile_t)
 
-TIFFCheckTile = libtiff.TIFFCheckTile
-TIFFCheckTile.argtypes = [c_TIFF_p, c_uint32, c_uint32, c_uint32, c_tsample_t]
-TIFFCheckTile.restype = c_int
+TIFFCheckTile = _Function("TIFFCheckTile",
+                          [c_TIFF_p, c_uint32, c_uint32, c_uint32,
+                           c_tsample_t], c_int)
 
-TIFFNumberOfTiles = libtiff.TIFFNumberOfTiles
-TIFFNumberOfTiles.argtypes = [c_TIFF_p]
-TIFFNumberOfTiles.restype = c_ttile_t
+TIFFNumberOfTiles = _Function("TIFFNumberOfTiles", [c_TIFF_p], c_ttile_t)
 
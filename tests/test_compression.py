@@ -0,0 +1,32 @@
+import os
+import shutil
+import tempfile
+
+import numpy
+
+import numtiff
+from numtiff import *
+
+
+def test_numpy_integer_codec():
+    compression = numtiff.Compression(numpy.uint16(COMPRESSION_ADOBE_DEFLATE),
+                                      level=numpy.int64(6),
+                                      predictor=numpy.int32(2))
+    assert type(compression.codec) is int
+    assert type(compression.predictor) is int
+    assert compression.codec == COMPRESSION_ADOBE_DEFLATE
+    assert compression.predictor == PREDICTOR_HORIZONTAL
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, "deflate.tif")
+        image = numpy.arange(30 * 40, dtype=numpy.uint16).reshape(30, 40)
+        with numtiff.tiffopen(path, "w") as tiff:
+            numtiff.write_gray_stripped_image(tiff, image,
+                                              compression=compression)
+        with numtiff.tiffopen(path) as tiff:
+            assert numtiff.page_info(tiff).compression == \
+                COMPRESSION_ADOBE_DEFLATE
+            assert (numtiff.read_image(tiff) == image).all()
+    finally:
+        shutil.rmtree(tmpdir)
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+from ctypes import POINTER, c_uint16
+
+import numpy
+import pytest
+
+import numtiff
+from numtiff import *
+
+
+@pytest.fixture
+def tmpdir():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path)
+
+
+def write_raw(path, pages, photometric, sample_format=SAMPLEFORMAT_UINT,
+              colormap=None, rows_per_strip=5):
+    # Write each (height, width[, samples]) page with the given fields,
+    # bypassing the numtiff writers.
+    with numtiff.tiffopen(path, "w") as tiff:
+        for page in pages:
+            samples = page.shape[2] if page.ndim == 3 else 1
+            TIFFSetField(tiff, TIFFTAG_IMAGEWIDTH, page.shape[1])
+            TIFFSetField(tiff, TIFFTAG_IMAGELENGTH, page.shape[0])
+            TIFFSetField(tiff, TIFFTAG_SAMPLESPERPIXEL, samples)
+            TIFFSetField(tiff, TIFFTAG_BITSPERSAMPLE, page.dtype.itemsize * 8)
+            TIFFSetField(tiff, TIFFTAG_SAMPLEFORMAT, sample_format)
+            TIFFSetField(tiff, TIFFTAG_PHOTOMETRIC, photometric)
+            TIFFSetField(tiff, TIFFTAG_PLANARCONFIG, PLANARCONFIG_CONTIG)
+            TIFFSetField(tiff, TIFFTAG_ROWSPERSTRIP, rows_per_strip)
+            if colormap is not None:
+                TIFFSetField(tiff, TIFFTAG_COLORMAP,
+                             *[channel.ctypes.data_as(POINTER(c_uint16))
+                               for channel in colormap])
+            for strip, row in enumerate(range(0, page.shape[0],
+                                              rows_per_strip)):
+                data = numpy.ascontiguousarray(page[row:row + rows_per_strip])
+                TIFFWriteEncodedStrip(tiff, strip,
+                                      data.ctypes.data_as(c_tdata_t),
+                                      data.nbytes)
+            TIFFWriteDirectory(tiff)
+
+
+def check_readers(path, pages):
+    with numtiff.tiffopen(path) as tiff:
+        assert (numtiff.read_region(tiff, 3, 17, 2, 9) ==
+                pages[0][3:17, 2:9]).all()
+        stack = numtiff.TiffStack(tiff)
+        for i, page in enumerate(pages):
+            assert (stack[i] == page).all()
+        assert (numtiff.read_stack(tiff) == numpy.array(pages)).all()
+        stack.select(0)
+        bands = list(band.copy() for band in numtiff.iter_strips(tiff))
+        assert (numpy.concatenate(bands) == pages[0]).all()
+        stack.select(1)
+        assert (numtiff.read_level(tiff, (1, 1)) == pages[1]).all()
+
+
+def test_palette_pages_read_as_indices(tmpdir):
+    path = os.path.join(tmpdir, "palette.tif")
+    pages = [(numpy.arange(20 * 13) * (i + 3) % 256).astype(numpy.uint8)
+             .reshape(20, 13) for i in range(2)]
+    colormap = [(numpy.arange(256) * 257 * k % 65536).astype(numpy.uint16)
+                for k in (1, 3, 7)]
+    write_raw(path, pages, PHOTOMETRIC_PALETTE, colormap=colormap)
+    check_readers(path, pages)
+
+
+def test_signed_rgb_pages_read_as_samples(tmpdir):
+    path = os.path.join(tmpdir, "rgb_int8.tif")
+    pages = [(numpy.arange(20 * 13 * 3) * (i + 5) % 256 - 128)
+             .astype(numpy.int8).reshape(20, 13, 3) for i in range(2)]
+    write_raw(path, pages, PHOTOMETRIC_RGB, sample_format=SAMPLEFORMAT_INT)
+    check_readers(path, pages)
@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+
+import numpy
+
+import numtiff
+from numtiff.libtiff import _handle_state
+
+
+def test_levels_scanned_once_per_handle(monkeypatch):
+    scans = []
+    scan_levels = numtiff._scan_levels
+
+    def counting_scan_levels(tiff):
+        scans.append(numtiff.TIFFCurrentDirOffset(tiff).value)
+        return scan_levels(tiff)
+
+    monkeypatch.setattr(numtiff, "_scan_levels", counting_scan_levels)
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, "levels.tif")
+        image = (numpy.arange(256 * 320) % 251).astype(numpy.uint8)
+        image = image.reshape(256, 320)
+        with numtiff.tiffopen(path, "w") as tiff:
+            numtiff.write_tiled_image(tiff, image, tile=(64, 64), levels=2)
+
+        with numtiff.tiffopen(path) as tiff:
+            levels = numtiff.image_levels(tiff)
+            assert [level[:2] for level in levels] == \
+                [(256, 320), (128, 160), (64, 80)]
+            levels.pop()
+            assert numtiff.image_levels(tiff)[-1][:2] == (64, 80)
+            assert numtiff.read_level(tiff, (100, 100)).shape == (128, 160)
+            assert (numtiff.read_level(tiff, (300, 300)) == image).all()
+            assert len(scans) == 1
+            address = tiff.value
+        assert address not in _handle_state
+
+        with numtiff.tiffopen(path) as tiff:
+            numtiff.image_levels(tiff)
+        assert len(scans) == 2
+    finally:
+        shutil.rmtree(tmpdir)
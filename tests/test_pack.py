@@ -0,0 +1,130 @@
+import os
+import shutil
+import tempfile
+
+import numpy
+import pytest
+
+import numtiff
+
+
+@pytest.fixture
+def tmpdir():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path)
+
+
+def random_samples(bits, shape, seed=19):
+    rng = numpy.random.RandomState(seed + bits)
+    samples = rng.randint(0, 1 << bits, size=shape, dtype=numpy.int64)
+    return samples.astype(numtiff._uint_dtype(bits))
+
+
+def reference_pack(row, bits):
+    # Pack one row the slow way, through a string of bits.
+    stream = "".join(format(int(value), "0%db" % bits) for value in row)
+    stream += "0" * (-len(stream) % 8)
+    return [int(stream[i:i + 8], 2) for i in range(0, len(stream), 8)]
+
+
+@pytest.mark.parametrize("bits", range(1, 32))
+def test_pack_samples(bits):
+    for count in (1, 2, 3, 5, 7, 8, 9, 16, 17, 61):
+        samples = random_samples(bits, (3, count))
+        packed = numtiff._pack_samples(samples, bits)
+        assert packed.dtype == numpy.uint8
+        for row, packed_row in zip(samples, packed):
+            assert list(packed_row) == reference_pack(row, bits)
+        assert (numtiff._unpack_samples(packed, bits, count) == samples).all()
+
+
+@pytest.mark.parametrize("mode", ["wl", "wb"])
+@pytest.mark.parametrize("workers", [1, 4])
+@pytest.mark.parametrize("bits", [1, 2, 3, 4, 5, 7, 9, 10, 12, 14, 15, 17,
+                                  20, 24, 27, 31])
+def test_write_packed_gray(tmpdir, mode, workers, bits):
+    path = os.path.join(tmpdir, "packed.tif")
+    image = random_samples(bits, (700, 333))
+    compression = numtiff.Compression("deflate")
+    with numtiff.tiffopen(path, mode) as tiff:
+        numtiff.write_gray_stripped_image(tiff, image, multiplane=True,
+                                          compression=compression,
+                                          workers=workers,
+                                          bits_per_sample=bits)
+        writer = numtiff.TiffWriter(tiff)
+        writer.begin_page(image.shape, image.dtype, multiplane=True,
+                          rows_per_strip=64, bits_per_sample=bits)
+        for lo in range(0, image.shape[0], 100):
+            writer.write_rows(image[lo:lo + 100])
+        writer.end_page()
+    with numtiff.tiffopen(path) as tiff:
+        for page in range(2):
+            assert numtiff.page_info(tiff).bits_per_sample == bits
+            pixels = numtiff.read_image(tiff)
+            assert pixels.dtype == image.dtype
+            assert (pixels == image).all()
+            numtiff.TIFFReadDirectory(tiff)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_write_bilevel(tmpdir, workers):
+    path = os.path.join(tmpdir, "bilevel.tif")
+    image = random_samples(3, (900, 1001)) * 10
+    with numtiff.tiffopen(path, "w") as tiff:
+        numtiff.write_bilevel_stripped_image(
+            tiff, image, compression=numtiff.Compression("deflate"),
+            workers=workers)
+    with numtiff.tiffopen(path) as tiff:
+        assert numtiff.page_info(tiff).rows_per_strip < image.shape[0]
+        assert (numtiff.read_image(tiff) == (image != 0)).all()
+
+
+def test_values_checked_before_writing(tmpdir, monkeypatch):
+    written = []
+    monkeypatch.setattr(numtiff, "_write_strip",
+                        lambda tiff, strip, data: written.append(strip))
+    path = os.path.join(tmpdir, "overflow.tif")
+    image = random_samples(12, (300, 300))
+    image[-1, -1] = 1 << 12
+    with numtiff.tiffopen(path, "w") as tiff:
+        with pytest.raises(ValueError):
+            numtiff.write_gray_stripped_image(tiff, image, bits_per_sample=12)
+    assert not written
+
+
+@pytest.mark.parametrize("mode", ["wl", "wb"])
+@pytest.mark.parametrize("workers", [1, 4])
+@pytest.mark.parametrize("bits, dtype", [(8, numpy.uint16),
+                                         (16, numpy.uint32),
+                                         (24, numpy.uint32),
+                                         (32, numpy.uint64)])
+def test_write_whole_bytes_from_wider_type(tmpdir, mode, workers, bits,
+                                           dtype):
+    path = os.path.join(tmpdir, "wide.tif")
+    image = random_samples(bits, (500, 301)).astype(dtype)
+    with numtiff.tiffopen(path, mode) as tiff:
+        numtiff.write_gray_stripped_image(
+            tiff, image, compression=numtiff.Compression("deflate"),
+            workers=workers, bits_per_sample=bits)
+    with numtiff.tiffopen(path) as tiff:
+        assert numtiff.page_info(tiff).bits_per_sample == bits
+        assert (numtiff.read_image(tiff) == image).all()
+
+
+@pytest.mark.parametrize("mode, expected", [("wl", b"\x03\x02\x01"),
+                                            ("wb", b"\x01\x02\x03")])
+def test_24_bit_samples_in_file_byte_order(tmpdir, mode, expected):
+    path = os.path.join(tmpdir, "uint24.tif")
+    image = numpy.full((4, 5), 0x010203, dtype=numpy.uint32)
+    with numtiff.tiffopen(path, mode) as tiff:
+        numtiff.write_gray_stripped_image(tiff, image, bits_per_sample=24)
+    with numtiff.tiffopen(path) as tiff:
+        offset = numtiff.c_uint64 if numtiff.has_bigtiff else numtiff.c_uint32
+        offsets = numtiff.POINTER(offset)()
+        numtiff.TIFFGetField(tiff, numtiff.TIFFTAG_STRIPOFFSETS,
+                             numtiff.byref(offsets))
+        start = offsets[0]
+    with open(path, "rb") as f:
+        data = f.read()
+    assert data[start:start + 3 * image.size] == expected * image.size
@@ -0,0 +1,40 @@
+import os
+import shutil
+import tempfile
+
+import numpy
+
+import numtiff
+from numtiff.libtiff import _handle_state
+
+
+def test_page_info_not_reused_after_tiffclose():
+    # Both files have their first directory at the same offset, and a handle
+    # opened after TIFFClose may be allocated at the address of the old one.
+    tmpdir = tempfile.mkdtemp()
+    try:
+        a_path = os.path.join(tmpdir, "a.tif")
+        c_path = os.path.join(tmpdir, "c.tif")
+        a = numpy.arange(64 * 80, dtype=numpy.uint16).reshape(64, 80)
+        c = (numpy.arange(64 * 160) % 256).astype(numpy.uint8).reshape(64, 160)
+        with numtiff.tiffopen(a_path, "w") as tiff:
+            numtiff.write_gray_stripped_image(tiff, a)
+        with numtiff.tiffopen(c_path, "w") as tiff:
+            numtiff.write_gray_stripped_image(tiff, c)
+
+        tiff = numtiff.TIFFOpen(a_path.encode(), b"r")
+        assert (numtiff.read_image(tiff) == a).all()
+        address = tiff.value
+        numtiff.TIFFClose(tiff)
+        assert address not in _handle_state
+
+        tiff = numtiff.TIFFOpen(c_path.encode(), b"r")
+        try:
+            assert numtiff.page_info(tiff).offset == 10248
+            image = numtiff.read_image(tiff)
+            assert image.shape == (64, 160) and image.dtype == numpy.uint8
+            assert (image == c).all()
+        finally:
+            numtiff.TIFFClose(tiff)
+    finally:
+        shutil.rmtree(tmpdir)
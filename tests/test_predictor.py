@@ -0,0 +1,92 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy
+import pytest
+
+import numtiff
+
+
+@pytest.fixture
+def tmpdir():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path)
+
+
+def make_image(dtype, height=400, width=217):
+    # A smooth ramp plus noise, so that the predictor has work to do.
+    rng = numpy.random.RandomState(6)
+    ramp = numpy.add.outer(numpy.arange(height), 3 * numpy.arange(width))
+    image = ramp + rng.randint(0, 4, size=(height, width))
+    if numpy.dtype(dtype).kind == "f":
+        return (image / 7.0 - 100).astype(dtype)
+    return (image % (numpy.iinfo(dtype).max + 1)).astype(dtype)
+
+
+@pytest.mark.parametrize("mode", ["wl", "wb"])
+@pytest.mark.parametrize("workers", [1, 4])
+@pytest.mark.parametrize("codec", ["deflate", "lzw"])
+@pytest.mark.parametrize("dtype, predictor", [
+    (numpy.uint8, "horizontal"),
+    (numpy.uint16, "horizontal"),
+    (numpy.float32, "horizontal"),
+    (numpy.float32, "float"),
+])
+def test_predictor_roundtrip(tmpdir, mode, workers, codec, dtype, predictor):
+    path = os.path.join(tmpdir, "predictor.tif")
+    image = make_image(dtype)
+    compression = numtiff.Compression(codec, predictor=predictor)
+    with numtiff.tiffopen(path, mode) as tiff:
+        big_endian = sys.byteorder == "big"
+        assert bool(numtiff.TIFFIsByteSwapped(tiff)) == \
+            ((mode == "wb") != big_endian)
+        numtiff.write_gray_stripped_image(tiff, image, multiplane=True,
+                                          compression=compression,
+                                          workers=workers)
+        numtiff.write_gray_stripped_image(tiff, image[::-1], multiplane=True,
+                                          compression=compression,
+                                          workers=workers)
+    with numtiff.tiffopen(path) as tiff:
+        info = numtiff.page_info(tiff)
+        assert info.rows_per_strip < image.shape[0]
+        predictor_field = numtiff.c_uint16()
+        numtiff.TIFFGetField(tiff, numtiff.TIFFTAG_PREDICTOR,
+                             numtiff.byref(predictor_field))
+        assert predictor_field.value == compression.predictor
+        pages = numtiff.read_stack(tiff)
+    assert pages.dtype == image.dtype
+    assert (pages[0] == image).all()
+    assert (pages[1] == image[::-1]).all()
+
+
+@pytest.mark.parametrize("mode", ["wl", "wb"])
+@pytest.mark.parametrize("workers", [1, 4])
+def test_horizontal_predictor_rgb(tmpdir, mode, workers):
+    path = os.path.join(tmpdir, "rgb.tif")
+    image = numpy.dstack([make_image(numpy.uint8) + k for k in (0, 50, 150)])
+    compression = numtiff.Compression("deflate", predictor="horizontal")
+    with numtiff.tiffopen(path, mode) as tiff:
+        numtiff.write_rgb_stripped_image(tiff, image, compression=compression,
+                                         workers=workers)
+    with numtiff.tiffopen(path) as tiff:
+        assert (numtiff.read_image(tiff) == image).all()
+
+
+@pytest.mark.parametrize("mode", ["wl", "wb"])
+@pytest.mark.parametrize("predictor", ["horizontal", "float"])
+def test_predictor_tiff_writer(tmpdir, mode, predictor):
+    path = os.path.join(tmpdir, "writer.tif")
+    image = make_image(numpy.float32)
+    compression = numtiff.Compression("deflate", predictor=predictor)
+    with numtiff.tiffopen(path, mode) as tiff:
+        writer = numtiff.TiffWriter(tiff)
+        writer.begin_page(image.shape, image.dtype, compression=compression,
+                          rows_per_strip=16)
+        for lo in range(0, image.shape[0], 50):
+            writer.write_rows(image[lo:lo + 50])
+        writer.end_page()
+    with numtiff.tiffopen(path) as tiff:
+        assert (numtiff.read_image(tiff) == image).all()
@@ -0,0 +1,35 @@
+import os
+import shutil
+import tempfile
+
+import numpy
+
+import numtiff
+
+
+def test_strip_buffer_bounded_by_image():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, "writer.tif")
+        image = numpy.arange(10 * 20000, dtype=numpy.uint16).reshape(10, 20000)
+        with numtiff.tiffopen(path, "w") as tiff:
+            writer = numtiff.TiffWriter(tiff)
+            writer.begin_page(image.shape, image.dtype,
+                              compression=numtiff.Compression("lzw"),
+                              rows_per_strip=8192)
+            assert writer._strip_buffer.shape == image.shape
+            for row in image:
+                writer.write_rows(row[None])
+            writer.end_page()
+
+            writer.begin_page(image.shape, image.dtype,
+                              compression=numtiff.Compression("lzw"))
+            assert writer._strip_buffer.nbytes <= max(numtiff._strip_bytes,
+                                                      image[0].nbytes)
+            writer.write_rows(image)
+            writer.end_page()
+        with numtiff.tiffopen(path) as tiff:
+            for page in numtiff.read_stack(tiff):
+                assert (page == image).all()
+    finally:
+        shutil.rmtree(tmpdir)
@@ -0,0 +1,34 @@
+import os
+import shutil
+import tempfile
+
+import numpy
+
+import numtiff
+
+
+def write_constant(path, value):
+    with numtiff.tiffopen(path, "w") as tiff:
+        numtiff.write_tiled_image(tiff, numpy.full((64, 64), value,
+                                                   numpy.uint16),
+                                  tile=(32, 32))
+
+
+def test_file_replaced_by_rename_is_not_served_from_cache():
+    tmpdir = tempfile.mkdtemp()
+    previous = numtiff.set_tile_cache(numtiff.TileCache(1 << 20))
+    try:
+        path = os.path.join(tmpdir, "image.tif")
+        new_path = os.path.join(tmpdir, "new.tif")
+        write_constant(path, 1)
+        with numtiff.tiffopen(path) as old:
+            assert (numtiff.read_image(old) == 1).all()
+            write_constant(new_path, 2)
+            os.rename(new_path, path)
+            # The old handle still reads the replaced file.
+            assert (numtiff.read_image(old) == 1).all()
+            with numtiff.tiffopen(path) as new:
+                assert (numtiff.read_image(new) == 2).all()
+    finally:
+        numtiff.set_tile_cache(previous)
+        shutil.rmtree(tmpdir)